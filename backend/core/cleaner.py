@@ -1,13 +1,83 @@
 import json
-import re
 import logging
-from typing import Dict, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, List, Tuple
 import yfinance as yf
-import requests
 from utils.config import GEMINI, POLYGON_KEY
+from utils.cache import DiskCache
+from utils.http import create_session, response_json
+from utils.utils import extract_json_block
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connection to Polygon for fallback ticker validation
+_SESSION = create_session(status_forcelist=(429, 500, 502, 503, 504))
+
+# Company -> ticker mappings change on the order of weeks
+_RESOLVE_CACHE = DiskCache("company_resolution", ttl=7 * 24 * 3600)
+_YFINANCE_CACHE = DiskCache("yfinance_validation", ttl=7 * 24 * 3600)
+_POLYGON_CACHE = DiskCache("polygon_validation", ttl=7 * 24 * 3600)
+# Tickers a provider reported as unknown; short TTL so they get retried soon
+_VALIDATION_MISSES = DiskCache("ticker_validation_misses", ttl=3600)
+
+# Yahoo's symbol search: one small JSON response with the listed names,
+# instead of the 200+ field profile behind yf.Ticker(...).info
+YAHOO_SEARCH_URL = "https://query2.finance.yahoo.com/v1/finance/search"
+_YAHOO_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+
+# Concurrent lookups when validating a primary ticker + alternatives
+MAX_VALIDATION_WORKERS = 8
+
+# Static part of the resolver prompt; only the user text is appended per call
+_RESOLVE_PROMPT_HEAD = (
+    "You are a finance ticker resolver.\n"
+    "Given a user input that might refer to a public company, ETF, fund, commodity future, or brand nickname:\n"
+    "1. Infer the most likely official entity name.\n"
+    "2. Infer the most likely primary U.S.-tradable market symbol for that thing "
+    "(stock ticker, ETF ticker, mutual fund ticker, or widely quoted futures symbol like GC=F for gold futures).\n"
+    "3. Estimate confidence from 0-100.\n"
+    "4. If multiple possibilities exist, you may provide alternatives.\n\n"
+    "Return ONLY strict JSON:\n"
+    '{\n'
+    '  "company": "<clean name>",\n'
+    '  "ticker": "<symbol or empty string if totally unknown>",\n'
+    '  "confidence": <integer 0-100>,\n'
+    '  "alternatives": [{"company": "<name>", "ticker": "<symbol>", "official_name": "<listed name>"}]  // optional\n'
+    '}\n'
+    "Do not add any commentary.\n\n"
+)
+
+
+def _yahoo_search_quote(ticker: str) -> Tuple[Optional[Dict], bool]:
+    """
+    Find the exact symbol on Yahoo's search endpoint.
+
+    Returns:
+        (quote, answered): the matching quote dict (symbol, longname,
+        shortname, ...) or None, and whether the endpoint actually answered.
+        A None quote with answered=True is a definitive "no such symbol";
+        answered=False means the request failed (callers fall back to yfinance)
+    """
+    try:
+        resp = _SESSION.get(
+            YAHOO_SEARCH_URL,
+            params={"q": ticker, "quotesCount": 5, "newsCount": 0},
+            headers=_YAHOO_HEADERS,
+            timeout=3,
+        )
+        if resp.status_code != 200:
+            return None, False
+        quotes = response_json(resp).get("quotes") or []
+    except Exception as e:
+        logger.debug(f"Yahoo search failed for '{ticker}': {e}")
+        return None, False
+
+    symbol = ticker.upper()
+    for quote in quotes:
+        if str(quote.get("symbol", "")).upper() == symbol:
+            return quote, True
+    return None, True
+
 
 def validate_ticker_yfinance(ticker: str, expected_company: str) -> Optional[Dict[str, str]]:
     """
@@ -23,13 +93,36 @@ def validate_ticker_yfinance(ticker: str, expected_company: str) -> Optional[Dic
     if not ticker:
         return None
 
+    cache_key = f"{ticker.upper()}|{(expected_company or '').strip().lower()}"
+    cached = _YFINANCE_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info(f"Validated ticker '{ticker}' -> '{cached['company']}' (cached)")
+        return cached
+
+    miss_key = f"yfinance|{ticker.upper()}"
+    if _VALIDATION_MISSES.get(miss_key):
+        logger.info(f"Ticker '{ticker}' not found in yfinance (cached)")
+        return None
+
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        quote, searched = _yahoo_search_quote(ticker)
+        if quote:
+            info = {
+                "symbol": quote["symbol"],
+                "longName": quote.get("longname"),
+                "shortName": quote.get("shortname"),
+            }
+        else:
+            # Search missed or failed: fall back to the full yfinance profile
+            info = yf.Ticker(ticker).info
 
         # Check if ticker exists and has basic info
         if not info or 'symbol' not in info:
             logger.warning(f"Ticker '{ticker}' not found in yfinance")
+            # An empty .info is also what a throttled/blocked request looks
+            # like, so only remember the miss when the search said so
+            if searched:
+                _VALIDATION_MISSES.set(miss_key, True)
             return None
 
         # Get official company name
@@ -54,7 +147,9 @@ def validate_ticker_yfinance(ticker: str, expected_company: str) -> Optional[Dic
                     # Still return it but log the mismatch
 
         logger.info(f"Validated ticker '{ticker}' -> '{official_name}'")
-        return {"company": official_name, "ticker": ticker.upper()}
+        result = {"company": official_name, "ticker": ticker.upper()}
+        _YFINANCE_CACHE.set(cache_key, result)
+        return result
 
     except Exception as e:
         logger.warning(f"yfinance validation error for '{ticker}': {e}")
@@ -74,20 +169,37 @@ def validate_ticker_polygon(ticker: str) -> Optional[Dict[str, str]]:
     if not ticker or not POLYGON_KEY:
         return None
 
+    cache_key = ticker.upper()
+    cached = _POLYGON_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info(f"Polygon validated ticker '{ticker}' -> '{cached['company']}' (cached)")
+        return cached
+
+    miss_key = f"polygon|{cache_key}"
+    if _VALIDATION_MISSES.get(miss_key):
+        logger.info(f"Polygon could not validate ticker '{ticker}' (cached)")
+        return None
+
     try:
         url = f"https://api.polygon.io/v3/reference/tickers/{ticker}"
         params = {"apiKey": POLYGON_KEY}
 
-        resp = requests.get(url, params=params, timeout=5)
+        resp = _SESSION.get(url, params=params, timeout=5)
 
         if resp.status_code == 200:
-            data = resp.json()
+            data = response_json(resp)
             results = data.get('results', {})
 
             if results:
                 company_name = results.get('name', ticker)
                 logger.info(f"Polygon validated ticker '{ticker}' -> '{company_name}'")
-                return {"company": company_name, "ticker": ticker.upper()}
+                result = {"company": company_name, "ticker": cache_key}
+                _POLYGON_CACHE.set(cache_key, result)
+                return result
+
+        if resp.status_code == 404:
+            # definitive "unknown ticker" (not a rate limit / outage / odd payload)
+            _VALIDATION_MISSES.set(miss_key, True)
 
         logger.warning(f"Polygon could not validate ticker '{ticker}' (status {resp.status_code})")
         return None
@@ -97,6 +209,29 @@ def validate_ticker_polygon(ticker: str) -> Optional[Dict[str, str]]:
         return None
 
 
+def _validate_all(pairs: List[Tuple[str, str]]) -> List[Optional[Dict[str, str]]]:
+    """
+    Validate several (ticker, expected_company) pairs.
+
+    Runs validate_ticker_yfinance() for all pairs concurrently, then
+    validate_ticker_polygon() for the ones yfinance rejected, again in a
+    single concurrent round. Results come back in input order.
+    """
+    if not pairs:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(MAX_VALIDATION_WORKERS, len(pairs))) as pool:
+        results = list(pool.map(lambda pair: validate_ticker_yfinance(*pair), pairs))
+
+        rejected = [i for i, validated in enumerate(results) if validated is None]
+        if rejected:
+            fallbacks = pool.map(validate_ticker_polygon, [pairs[i][0] for i in rejected])
+            for i, validated in zip(rejected, fallbacks):
+                results[i] = validated
+
+    return results
+
+
 def clean_company_and_ticker(user_company: str) -> Dict:
     """
     Resolve user company input to normalized name and ticker symbol.
@@ -117,26 +252,28 @@ def clean_company_and_ticker(user_company: str) -> Dict:
         - 'candidates': List of candidate matches (if needs_confirmation=True)
         - 'needs_confirmation': Bool indicating if user input is needed
         - 'confidence': LLM confidence score (0-100)
+
+    Results are cached on disk keyed by the normalized input, so repeat
+    lookups (e.g. "Tesla", "AAPL") skip the Gemini + validation round-trips.
+    Only validated resolutions (a ticker, no confirmation needed) are cached.
     """
-    prompt = (
-        "You are a finance ticker resolver.\n"
-        "Given a user input that might refer to a public company, ETF, fund, commodity future, or brand nickname:\n"
-        "1. Infer the most likely official entity name.\n"
-        "2. Infer the most likely primary U.S.-tradable market symbol for that thing "
-        "(stock ticker, ETF ticker, mutual fund ticker, or widely quoted futures symbol like GC=F for gold futures).\n"
-        "3. Estimate confidence from 0-100.\n"
-        "4. If multiple possibilities exist, you may provide alternatives.\n\n"
-        "Return ONLY strict JSON:\n"
-        '{\n'
-        '  "company": "<clean name>",\n'
-        '  "ticker": "<symbol or empty string if totally unknown>",\n'
-        '  "confidence": <integer 0-100>,\n'
-        '  "alternatives": [{"company": "<name>", "ticker": "<symbol>"}]  // optional\n'
-        '}\n'
-        "Do not add any commentary.\n\n"
-        f'User text: "{user_company}"\n'
-        "JSON:"
-    )
+    cache_key = user_company.strip().lower()
+    cached = _RESOLVE_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info(f"Resolved '{user_company.strip()}' from cache -> {cached.get('ticker') or 'no ticker'}")
+        return cached
+
+    result = _resolve_company_and_ticker(user_company)
+    # Only pin answers whose ticker was validated; a confirmation prompt may
+    # just mean Yahoo/Polygon were briefly unreachable
+    if result.get("ticker") and result.get("needs_confirmation") is False:
+        _RESOLVE_CACHE.set(cache_key, result)
+    return result
+
+
+def _resolve_company_and_ticker(user_company: str) -> Dict:
+    """Uncached Gemini + validation resolution behind clean_company_and_ticker()."""
+    prompt = _RESOLVE_PROMPT_HEAD + f'User text: "{user_company}"\n' + "JSON:"
 
     original = user_company.strip()
 
@@ -146,8 +283,8 @@ def clean_company_and_ticker(user_company: str) -> Dict:
         raw = (getattr(resp, "text", "") or "").strip()
 
         # Attempt to extract the first {...} block
-        m = re.search(r"\{.*\}", raw, re.S)
-        if not m:
+        block = extract_json_block(raw)
+        if not block:
             logger.warning(f"Gemini did not return JSON for '{original}'. Using original value.")
             return {
                 "company": original,
@@ -157,7 +294,7 @@ def clean_company_and_ticker(user_company: str) -> Dict:
                 "confidence": 0
             }
 
-        data = json.loads(m.group(0))
+        data = json.loads(block)
 
         company = (data.get("company") or original).strip()
         ticker = (data.get("ticker") or "").strip().upper()
@@ -197,9 +334,27 @@ def clean_company_and_ticker(user_company: str) -> Dict:
         if confidence >= 50 or (confidence >= 80 and ticker):
             candidates = []
 
+            # official_name (the listed name) matches yfinance's longName best
+            alt_checks = [
+                (
+                    alt,
+                    alt.get("ticker", "").strip().upper(),
+                    (alt.get("official_name") or alt.get("company", "")).strip(),
+                )
+                for alt in alternatives
+            ]
+            alt_checks = [check for check in alt_checks if check[1]]
+
+            # Validate the primary ticker and all alternatives in one concurrent
+            # round (Polygon fallback for the rejected ones in a second)
+            pairs = [(alt_ticker, alt_company) for _, alt_ticker, alt_company in alt_checks]
+            if ticker:
+                pairs.insert(0, (ticker, company))
+            validations = _validate_all(pairs)
+
             # Add primary candidate if ticker exists
             if ticker:
-                validated = validate_ticker_yfinance(ticker, company)
+                validated = validations.pop(0)
                 if validated:
                     candidates.append({
                         "company": validated["company"],
@@ -216,17 +371,13 @@ def clean_company_and_ticker(user_company: str) -> Dict:
                     })
 
             # Add alternatives if provided
-            for alt in alternatives:
-                alt_ticker = alt.get("ticker", "").strip().upper()
-                alt_company = alt.get("company", "").strip()
-                if alt_ticker:
-                    validated = validate_ticker_yfinance(alt_ticker, alt_company)
-                    if validated:
-                        candidates.append({
-                            "company": validated["company"],
-                            "ticker": validated["ticker"],
-                            "confidence": alt.get("confidence", confidence - 10)
-                        })
+            for (alt, _, _), validated in zip(alt_checks, validations):
+                if validated:
+                    candidates.append({
+                        "company": validated["company"],
+                        "ticker": validated["ticker"],
+                        "confidence": alt.get("confidence", confidence - 10)
+                    })
 
             if candidates:
                 logger.info(f"Medium confidence: returning {len(candidates)} candidates for user confirmation")
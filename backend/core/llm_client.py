@@ -1,10 +1,75 @@
+import functools
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 
 from utils.config import GEMINI
+from utils.cache import DiskCache
+from utils.utils import load_json_block
 
 logger = logging.getLogger(__name__)
 
+# Static parts of the batched relevance prompt
+_BATCH_PROMPT_RULES = (
+    "For each numbered headline below, decide keep=true if it's about this company's "
+    "business/stock/products/execs/financials.\n"
+    "Use keep=false if it's about unrelated companies or topics.\n"
+    "Return ONLY a JSON array with one object per headline.\n\n"
+)
+_BATCH_PROMPT_TAIL = '\nReturn ONLY JSON array like: [{"i": 1, "keep": true}, {"i": 2, "keep": false}, ...]'
+
+# Rough chars-per-token ratio for budget estimates, and a per-headline
+# allowance for the numbering/labels and its answer object
+CHARS_PER_TOKEN = 4
+ROW_OVERHEAD_TOKENS = 20
+# Upper bound on headlines per prompt even when they are short, so answers stay parseable
+MAX_ROWS_PER_BATCH = 40
+# Relevance batches in flight at once (kept low for Gemini rate limits)
+MAX_CONCURRENT_BATCHES = 4
+
+# Keep/drop decisions per (company, headline); the same wire stories and
+# recycled headlines come back on every run within a day
+_DECISION_CACHE = DiskCache("relevance_decisions", ttl=24 * 3600)
+
+# A YES/NO reply: the answer must be the leading word (quotes/brackets from
+# JSON mode allowed), so "NOTE:", "NOT SURE" or "UNKNOWN" never count as NO
+_YES_NO_RE = re.compile(r"\W*(YES|NO)\b")
+
+
+def _decision_key(company: str, ticker: str, title: Optional[str], desc: Optional[str]) -> str:
+    """Cache key for one relevance decision (same truncation as the prompts)."""
+    raw = "\x1f".join((
+        (company or "").strip().lower(),
+        (ticker or "").upper(),
+        (title or "")[:300],
+        (desc or "")[:500],
+    ))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=64)
+def _ticker_mention_re(ticker: str) -> Optional["re.Pattern"]:
+    """
+    Pattern for an explicit ticker citation in a headline: "$AAPL",
+    "(AAPL)", "NASDAQ: AAPL". Plain words are not matched ("Apple", "F").
+    """
+    if not ticker:
+        return None
+    return re.compile(
+        r"(?:\$|\(|\b(?i:NYSE|NASDAQ|NYSEARCA|AMEX|OTC)\s*:\s*)"
+        + re.escape(ticker)
+        + r"(?![\w.=-])"
+    )
+
+
+def _cites_ticker(ticker: str, title: Optional[str]) -> bool:
+    """True if the headline explicitly cites the ticker symbol (no LLM needed)."""
+    pattern = _ticker_mention_re((ticker or "").upper())
+    return bool(pattern and title and pattern.search(title))
+
+
 def gemini_yes_no_company(company: str, ticker: str, title: str, desc: Optional[str]) -> bool:
     """
     Strict: fail CLOSED. Any GenAI error => return False (do not include).
@@ -20,6 +85,11 @@ def gemini_yes_no_company(company: str, ticker: str, title: str, desc: Optional[
     Returns:
         True if headline is about the company, False otherwise (including errors)
     """
+    cache_key = _decision_key(company, ticker, title, desc)
+    cached = _DECISION_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
     prompt = (
         f"Answer YES or NO. Is this headline about the COMPANY {company} (ticker {ticker or 'unknown'}), "
         "its business/stock/products/execs/financials—NOT unrelated firms?\n"
@@ -29,8 +99,28 @@ def gemini_yes_no_company(company: str, ticker: str, title: str, desc: Optional[
     )
 
     try:
-        resp = GEMINI.generate_content(prompt)
-        result = "YES" in (resp.text or "").strip().upper()
+        # The answer is decided by the first token, so stream and stop reading
+        # as soon as YES/NO shows up instead of waiting for the full response
+        resp = GEMINI.generate_content(prompt, stream=True)
+        text = ""
+        answer = None
+        for chunk in resp:
+            text += (getattr(chunk, "text", "") or "").upper()
+            match = _YES_NO_RE.match(text)
+            # a match at the very end may still grow ("NO" -> "NOTE")
+            if match and match.end() < len(text):
+                answer = match
+                break
+        else:
+            answer = _YES_NO_RE.match(text)
+
+        if answer:
+            result = answer.group(1) == "YES"
+            # Only real answers are cached
+            _DECISION_CACHE.set(cache_key, result)
+        else:
+            # Unexpected reply shape: judge it once, don't pin it in the cache
+            result = re.search(r"\bYES\b", text) is not None
 
         if result:
             logger.debug(f"LLM: YES - '{title[:50]}...'")
@@ -45,11 +135,233 @@ def gemini_yes_no_company(company: str, ticker: str, title: str, desc: Optional[
         return False
 
 
+def _parse_batch_answers(text: str, expected: int) -> Optional[List[Optional[bool]]]:
+    """
+    Parse a batched relevance response into one keep flag per headline.
+
+    Accepts the indexed form [{"i": 1, "keep": true}, ...] as well as a plain
+    positional ["YES", "NO", ...] array. Headlines the model skipped are left
+    as None; callers fail them CLOSED rather than re-querying one by one.
+
+    Args:
+        text: Raw LLM response text
+        expected: Number of headlines in the batch
+
+    Returns:
+        List of booleans (None where undecided), or None if no JSON array could be parsed
+    """
+    # load_json_block skips a bracketed aside ("Note [see below]: [...]")
+    answers = load_json_block(text, "[")
+    if not isinstance(answers, list):
+        return None
+
+    flags: List[Optional[bool]] = [None] * expected
+    decided = 0
+
+    for pos, ans in enumerate(answers):
+        if isinstance(ans, dict):
+            try:
+                idx = int(ans.get("i", pos + 1)) - 1
+            except (ValueError, TypeError):
+                continue
+            keep = ans.get("keep")
+            value = str(keep).strip().lower() in ("true", "yes")
+        else:
+            idx = pos
+            value = "YES" in str(ans).upper()
+
+        if 0 <= idx < expected:
+            flags[idx] = value
+            decided += 1
+
+    if decided != expected:
+        logger.warning(
+            f"Expected {expected} answers, got {decided}. "
+            f"Missing headlines are excluded (fail-closed)."
+        )
+
+    return flags
+
+
+def _plan_batches(
+    rows: List[Dict[str, Any]],
+    batch_size: int,
+    token_budget: Optional[int]
+) -> List[Tuple[int, int]]:
+    """
+    Split rows into (start, end) batches.
+
+    With token_budget, headlines are packed greedily until the estimated
+    prompt tokens would exceed the budget (short headlines share a call,
+    long ones get split up); otherwise every batch has batch_size rows.
+    """
+    total = len(rows)
+    if not token_budget:
+        return [(i, min(i + batch_size, total)) for i in range(0, total, batch_size)]
+
+    spans = []
+    start = 0
+    used = 0
+    for i, row in enumerate(rows):
+        chars = len((row.get("title") or "")[:300]) + len((row.get("description") or "")[:500])
+        cost = chars // CHARS_PER_TOKEN + ROW_OVERHEAD_TOKENS
+        if i > start and (used + cost > token_budget or i - start >= MAX_ROWS_PER_BATCH):
+            spans.append((start, i))
+            start, used = i, 0
+        used += cost
+    if start < total:
+        spans.append((start, total))
+    return spans
+
+
+def _judge_batch(
+    company: str,
+    ticker: str,
+    batch: List[Dict[str, Any]],
+    batch_idx: int,
+    num_batches: int
+) -> List[bool]:
+    """
+    Decide one relevance batch: cached decisions first, then a single batched
+    Gemini prompt for the rest (sequential per-headline fallback on failure).
+
+    Returns:
+        One bool per row in batch
+    """
+    # Headlines citing the ticker ("$AAPL", "(AAPL)") are kept outright, and
+    # decisions already made for a headline (earlier runs) are reused;
+    # only the rest go to Gemini
+    keys = [_decision_key(company, ticker, r.get("title"), r.get("description")) for r in batch]
+    flags = [
+        True if _cites_ticker(ticker, r.get("title")) else _DECISION_CACHE.get(k)
+        for r, k in zip(batch, keys)
+    ]
+    pending = [i for i, flag in enumerate(flags) if flag is None]
+
+    if not pending:
+        logger.info(f"Batch {batch_idx + 1}/{num_batches}: all {len(batch)} decided without Gemini")
+        return flags
+
+    work = [batch[i] for i in pending]
+    logger.info(
+        f"Processing batch {batch_idx + 1}/{num_batches} ({len(work)} headlines, "
+        f"{len(batch) - len(work)} decided locally/cached)"
+    )
+
+    # Build batch prompt
+    prompt_parts = [
+        f"You are filtering news headlines for relevance to {company} (ticker: {ticker or 'unknown'}).\n",
+        _BATCH_PROMPT_RULES,
+    ]
+
+    for i, row in enumerate(work, start=1):
+        title = (row.get("title") or "")[:300]
+        desc = (row.get("description") or "")[:500]
+        prompt_parts.append(f"{i}. Title: {title}\n   Description: {desc}\n")
+
+    prompt_parts.append(_BATCH_PROMPT_TAIL)
+    prompt = "".join(prompt_parts)
+
+    try:
+        # Stream the answer and stop reading once the answer array parses
+        # (the model sometimes appends prose after it)
+        resp = GEMINI.generate_content(prompt, stream=True)
+        text = ""
+        for chunk in resp:
+            piece = getattr(chunk, "text", "") or ""
+            text += piece
+            if "]" in piece:
+                answers = _parse_batch_answers(text, len(work))
+                if answers is not None:
+                    break
+        else:
+            answers = _parse_batch_answers(text.strip(), len(work))
+
+        if answers is None:
+            logger.warning(
+                f"Batch {batch_idx + 1}: Could not parse JSON response. "
+                f"Falling back to sequential processing."
+            )
+            # Fallback to sequential (these calls cache their own answers)
+            batch_results = [
+                gemini_yes_no_company(company, ticker, r.get("title", ""), r.get("description"))
+                for r in work
+            ]
+        else:
+            for i, answer in zip(pending, answers):
+                if answer is not None:
+                    _DECISION_CACHE.set(keys[i], answer)
+            # undecided headlines fail closed (not cached)
+            batch_results = [bool(answer) for answer in answers]
+            yes_count = sum(batch_results)
+            logger.info(f"Batch {batch_idx + 1}: {yes_count}/{len(work)} headlines passed")
+
+    except Exception as e:
+        logger.error(f"Batch {batch_idx + 1} failed: {e}. Falling back to sequential processing.")
+        # On batch failure, process sequentially (fail-closed for each item)
+        batch_results = [
+            gemini_yes_no_company(company, ticker, r.get("title", ""), r.get("description"))
+            for r in work
+        ]
+
+    for i, keep in zip(pending, batch_results):
+        flags[i] = keep
+
+    return flags
+
+
+def iter_relevance_batches(
+    company: str,
+    ticker: str,
+    rows: List[Dict[str, Any]],
+    batch_size: int = 10,
+    token_budget: Optional[int] = None
+) -> Iterator[Tuple[int, List[bool]]]:
+    """
+    Run the batched relevance filter, yielding each batch's flags as soon as
+    Gemini answers it.
+
+    Lets callers start downstream work (e.g. article fetching) on the first
+    batch while later batches are still being judged. Up to
+    MAX_CONCURRENT_BATCHES batches are in flight at once; results are still
+    yielded in row order. Headlines with a cached decision are answered from
+    the cache and left out of the prompt.
+
+    Args:
+        company: Company name
+        ticker: Stock ticker symbol
+        rows: List of dicts with 'title' and 'description' keys
+        batch_size: Number of headlines per batch (default 10)
+        token_budget: If set, pack batches by estimated prompt tokens instead of batch_size
+
+    Yields:
+        (start_idx, flags) - offset of the batch in rows and one bool per row
+    """
+    spans = _plan_batches(rows, batch_size, token_budget)
+    num_batches = len(spans)
+
+    if num_batches <= 1:
+        for batch_idx, (start_idx, end_idx) in enumerate(spans):
+            yield start_idx, _judge_batch(company, ticker, rows[start_idx:end_idx], batch_idx, num_batches)
+        return
+
+    # Batches are independent network calls: dispatch several at once and
+    # hand them back in order (pool size caps concurrent Gemini requests)
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_BATCHES, num_batches)) as pool:
+        futures = [
+            pool.submit(_judge_batch, company, ticker, rows[start_idx:end_idx], batch_idx, num_batches)
+            for batch_idx, (start_idx, end_idx) in enumerate(spans)
+        ]
+        for (start_idx, _), future in zip(spans, futures):
+            yield start_idx, future.result()
+
+
 def relevance_filter_batch(
     company: str,
     ticker: str,
     rows: List[Dict[str, Any]],
-    batch_size: int = 10
+    batch_size: int = 10,
+    token_budget: Optional[int] = None
 ) -> List[bool]:
     """
     Batch process headlines through LLM relevance filter.
@@ -62,6 +374,7 @@ def relevance_filter_batch(
         ticker: Stock ticker symbol
         rows: List of dicts with 'title' and 'description' keys
         batch_size: Number of headlines per batch (default 10)
+        token_budget: If set, pack batches by estimated prompt tokens instead of batch_size
 
     Returns:
         List of booleans indicating which headlines passed the filter
@@ -74,82 +387,8 @@ def relevance_filter_batch(
     logger.info(f"Starting LLM relevance filter for {total} headlines (batch_size={batch_size})")
 
     results = []
-    num_batches = (total + batch_size - 1) // batch_size  # Ceiling division
-
-    for batch_idx in range(num_batches):
-        start_idx = batch_idx * batch_size
-        end_idx = min(start_idx + batch_size, total)
-        batch = rows[start_idx:end_idx]
-
-        logger.info(f"Processing batch {batch_idx + 1}/{num_batches} ({len(batch)} headlines)")
-
-        # Build batch prompt
-        prompt_parts = [
-            f"You are filtering news headlines for relevance to {company} (ticker: {ticker or 'unknown'}).\n",
-            "For each headline below, answer YES if it's about this company's business/stock/products/execs/financials.\n",
-            "Answer NO if it's about unrelated companies or topics.\n",
-            "Return ONLY a JSON array of YES/NO values, one per headline.\n\n"
-        ]
-
-        for i, row in enumerate(batch, start=1):
-            title = (row.get("title") or "")[:300]
-            desc = (row.get("description") or "")[:500]
-            prompt_parts.append(f"{i}. Title: {title}\n   Description: {desc}\n")
-
-        prompt_parts.append("\nReturn ONLY JSON array like: [\"YES\", \"NO\", \"YES\", ...]")
-        prompt = "".join(prompt_parts)
-
-        try:
-            resp = GEMINI.generate_content(prompt)
-            text = (resp.text or "").strip()
-
-            # Try to extract JSON array
-            import json
-            import re
-
-            # Look for array pattern
-            match = re.search(r'\[.*?\]', text, re.DOTALL)
-            if match:
-                answers = json.loads(match.group(0))
-
-                # Validate we got the right number of answers
-                if len(answers) != len(batch):
-                    logger.warning(
-                        f"Batch {batch_idx + 1}: Expected {len(batch)} answers, got {len(answers)}. "
-                        f"Falling back to sequential processing."
-                    )
-                    # Fallback to sequential
-                    batch_results = [
-                        gemini_yes_no_company(company, ticker, r.get("title", ""), r.get("description"))
-                        for r in batch
-                    ]
-                else:
-                    # Convert YES/NO to boolean
-                    batch_results = ["YES" in str(ans).upper() for ans in answers]
-                    yes_count = sum(batch_results)
-                    logger.info(f"Batch {batch_idx + 1}: {yes_count}/{len(batch)} headlines passed")
-
-            else:
-                logger.warning(
-                    f"Batch {batch_idx + 1}: Could not parse JSON response. "
-                    f"Falling back to sequential processing."
-                )
-                # Fallback to sequential
-                batch_results = [
-                    gemini_yes_no_company(company, ticker, r.get("title", ""), r.get("description"))
-                    for r in batch
-                ]
-
-            results.extend(batch_results)
-
-        except Exception as e:
-            logger.error(f"Batch {batch_idx + 1} failed: {e}. Falling back to sequential processing.")
-            # On batch failure, process sequentially (fail-closed for each item)
-            batch_results = [
-                gemini_yes_no_company(company, ticker, r.get("title", ""), r.get("description"))
-                for r in batch
-            ]
-            results.extend(batch_results)
+    for _, batch_results in iter_relevance_batches(company, ticker, rows, batch_size, token_budget):
+        results.extend(batch_results)
 
     total_passed = sum(results)
     logger.info(f"LLM relevance filter complete: {total_passed}/{total} headlines passed")
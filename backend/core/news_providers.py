@@ -1,20 +1,79 @@
 import logging
-import requests
+import threading
+import time
 import pandas as pd
-from datetime import timedelta
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
 
 from utils.config import POLYGON_KEY, FINNHUB_KEY, NEWS_KEY, FINANCE_DOMAINS
-from utils.utils import utc_today, ymd, norm_title, drop_older_than
+from utils.utils import (
+    utc_today,
+    ymd,
+    norm_title_series,
+    drop_older_than,
+    to_arrow_strings,
+    to_object_strings,
+)
+from utils.cache import is_cache_enabled
+from utils.http import create_session, response_json
 
 logger = logging.getLogger(__name__)
 
+# One pooled session for all providers: keep-alive skips the TCP+TLS
+# handshake on repeat calls (NewsAPI pages, back-to-back runs)
+_SESSION = create_session(
+    pool_connections=8,
+    pool_maxsize=16,
+    status_forcelist=(429, 500, 502, 503, 504),
+)
+
+# Finnhub response keys consumed by fetch_finnhub
+FINNHUB_FIELDS = ["datetime", "source", "headline", "url", "summary", "id"]
+
+# Invariant NewsAPI query parts, built once at import
+_NEWSAPI_DOMAINS = ",".join(FINANCE_DOMAINS)
+_NEWSAPI_TOPIC_FILTER = (
+    '(stock OR shares OR earnings OR revenue OR guidance OR CEO OR product OR forecast '
+    'OR quarter OR Nasdaq OR "S&P 500") '
+    '-recipe -recipes -soup -pie -vegan -Thanksgiving -cook -cooking'
+)
+
+# Text columns handled as Arrow strings during merge/dedupe
+TEXT_COLUMNS = ["source", "title", "url", "description", "title_norm"]
+# Result skeleton when no provider returned anything
+_EMPTY_NEWS = pd.DataFrame(
+    columns=["date", "source", "title", "url", "description", "pid", "provider", "title_norm"]
+)
+
+# Low-cardinality columns held as categoricals while merging: dedupe and
+# sort hash small integer codes instead of strings
+CATEGORY_COLUMNS = ["source", "provider"]
+
+# Short-lived in-process cache of merged results, keyed on the call arguments;
+# repeat lookups of the same company within the window skip all provider calls
+NEWS_CACHE_TTL = 300  # seconds
+_NEWS_CACHE_MAX = 256
+_news_cache: Dict[Tuple, Tuple[float, pd.DataFrame]] = {}
+_news_cache_lock = threading.Lock()
+
+
+def _prepare_for_merge(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add title_norm to a single provider's frame.
+
+    Normalizing per provider runs on each fetch thread, so the merged frame
+    arrives ready for the dedupe passes.
+    """
+    df["title_norm"] = norm_title_series(df["title"])
+    return df
+
 
 def fetch_polygon(ticker: str, limit: int = 40) -> pd.DataFrame:
     """
     Pull recent ticker-tagged headlines from Polygon.
     Returns columns:
-    [date, source, title, url, description, pid, provider]
+    [date, source, title, url, description, pid, provider, title_norm]
     """
     if not POLYGON_KEY or not ticker:
         return pd.DataFrame()
@@ -26,22 +85,24 @@ def fetch_polygon(ticker: str, limit: int = 40) -> pd.DataFrame:
         "apiKey": POLYGON_KEY,
     }
 
-    r = requests.get(url, params=params, timeout=30)
+    r = _SESSION.get(url, params=params, timeout=30)
     r.raise_for_status()
-    items = r.json().get("results", []) or []
+    items = response_json(r).get("results", []) or []
     if not items:
         return pd.DataFrame()
 
-    df = pd.DataFrame(items)
+    # json_normalize flattens the nested publisher dict into "publisher.name"
+    # in one pass instead of a per-row Python lambda
+    df = pd.json_normalize(items)
 
     df["date"] = pd.to_datetime(
         df.get("published_utc"),
+        format="ISO8601",
         errors="coerce",
         utc=True,
+        cache=True,
     )
-    df["source"] = df.get("publisher").apply(
-        lambda s: (s or {}).get("name") if isinstance(s, dict) else s
-    )
+    df["source"] = df.get("publisher.name")
     df["title"] = df.get("title")
     df["url"] = df.get("article_url")
     df["description"] = df.get("description")
@@ -55,19 +116,25 @@ def fetch_polygon(ticker: str, limit: int = 40) -> pd.DataFrame:
         .reset_index(drop=True)
     )
 
-    return df
+    return _prepare_for_merge(df)
 
 
-def fetch_finnhub(ticker: str, days: int = 5, limit: int = 40) -> pd.DataFrame:
+def fetch_finnhub(
+    ticker: str,
+    days: int = 5,
+    limit: int = 40,
+    now: Optional[datetime] = None
+) -> pd.DataFrame:
     """
     Pull company news from Finnhub in window [today-days, today].
+    `now` pins "today" (fetch_recent_news passes one timestamp to every step).
     Returns columns:
-    [date, source, title, url, description, pid, provider]
+    [date, source, title, url, description, pid, provider, title_norm]
     """
     if not FINNHUB_KEY or not ticker:
         return pd.DataFrame()
 
-    end = utc_today()
+    end = utc_today(now)
     start = end - timedelta(days=max(1, days))
 
     url = "https://finnhub.io/api/v1/company-news"
@@ -78,58 +145,61 @@ def fetch_finnhub(ticker: str, days: int = 5, limit: int = 40) -> pd.DataFrame:
         "token": FINNHUB_KEY,
     }
 
-    r = requests.get(url, params=params, timeout=30)
+    r = _SESSION.get(url, params=params, timeout=30)
     r.raise_for_status()
-    data = r.json() or []
+    data = response_json(r) or []
     if not data:
         return pd.DataFrame()
 
-    df = pd.DataFrame(data)
+    # only materialize the keys we use (Finnhub also sends image, category, related, ...)
+    df = pd.DataFrame(data, columns=FINNHUB_FIELDS)
 
     df["date"] = pd.to_datetime(
-        df.get("datetime"),
+        df["datetime"],
         unit="s",
         errors="coerce",
         utc=True,
+        cache=True,
     )
     df["source"] = df.get("source")
     df["title"] = df.get("headline")
     df["url"] = df.get("url")
-    df["description"] = (
-        df.get("summary") if "summary" in df.columns else None
-    )
+    df["description"] = df["summary"]
     df["pid"] = df.get("id", None)
     df["provider"] = "finnhub"
 
     df = (
         df[["date", "source", "title", "url", "description", "pid", "provider"]]
         .dropna(subset=["title"])
-        .sort_values("date", ascending=False)
-        .head(limit)
+        .nlargest(limit, "date")
         .reset_index(drop=True)
     )
 
-    return df
+    return _prepare_for_merge(df)
 
 
-def fetch_newsapi(company: str, ticker: str, days: int = 7, limit: int = 40) -> pd.DataFrame:
+def fetch_newsapi(
+    company: str,
+    ticker: str,
+    days: int = 7,
+    limit: int = 40,
+    now: Optional[datetime] = None
+) -> pd.DataFrame:
     """
     Use NewsAPI 'everything' to search finance-y coverage in known finance domains.
+    `now` pins "today" (fetch_recent_news passes one timestamp to every step).
     Returns columns:
-    [date, source, title, url, description, pid, provider]
+    [date, source, title, url, description, pid, provider, title_norm]
     """
     if not NEWS_KEY:
         return pd.DataFrame()
 
-    end = utc_today()
+    end = utc_today(now)
     start = end - timedelta(days=max(1, days))
 
     # boolean query leaning hard toward market/financial coverage
     q = (
-        f'("{company}" OR {ticker} OR "{ticker} stock") AND '
-        f'(stock OR shares OR earnings OR revenue OR guidance OR CEO OR product OR forecast '
-        f'OR quarter OR Nasdaq OR "S&P 500") '
-        f'-recipe -recipes -soup -pie -vegan -Thanksgiving -cook -cooking'
+        f'("{company}" OR {ticker} OR "{ticker} stock") AND ' + _NEWSAPI_TOPIC_FILTER
     ).replace("OR  OR", "OR")
 
     url = "https://newsapi.org/v2/everything"
@@ -141,48 +211,32 @@ def fetch_newsapi(company: str, ticker: str, days: int = 7, limit: int = 40) ->
         "sortBy": "publishedAt",
         "searchIn": "title,description",
         "pageSize": min(max(1, limit), 100),
-        "page": 1,
-        "domains": ",".join(FINANCE_DOMAINS),
+        "domains": _NEWSAPI_DOMAINS,
         "apiKey": NEWS_KEY,
     }
 
-    items: List[Dict[str, Any]] = []
-
-    # paginate until we've got enough or hit ~100 articles
-    while len(items) < limit:
-        next_idx = (params["page"] - 1) * params["pageSize"]
-        if next_idx >= 100:
-            break
-
-        r = requests.get(url, params=params, timeout=30)
-        if r.status_code != 200:
-            break
-
-        data = r.json()
-        arts = data.get("articles", []) or []
-        if not arts:
-            break
-
-        items.extend(arts)
-
-        if len(items) >= limit or len(items) >= 100:
-            break
-
-        params["page"] += 1
+    r = _SESSION.get(url, params=params, timeout=30)
+    if r.status_code != 200:
+        return pd.DataFrame()
 
+    data = response_json(r)
+    items: List[Dict[str, Any]] = data.get("articles", []) or []
     if not items:
         return pd.DataFrame()
 
-    df = pd.DataFrame(items)
+    # pageSize is min(limit, 100), so a single page always covers `limit`
+    items = items[:limit]
+
+    df = pd.json_normalize(items)
 
     df["date"] = pd.to_datetime(
         df.get("publishedAt"),
+        format="ISO8601",
         errors="coerce",
         utc=True,
+        cache=True,
     )
-    df["source"] = df["source"].apply(
-        lambda s: (s or {}).get("name") if isinstance(s, dict) else s
-    )
+    df["source"] = df.get("source.name")
     df["title"] = df.get("title")
     df["url"] = df.get("url")
     df["description"] = df.get("description")
@@ -192,12 +246,11 @@ def fetch_newsapi(company: str, ticker: str, days: int = 7, limit: int = 40) ->
     df = (
         df[["date", "source", "title", "url", "description", "pid", "provider"]]
         .dropna(subset=["title"])
-        .sort_values("date", ascending=False)
-        .head(limit)
+        .nlargest(limit, "date")
         .reset_index(drop=True)
     )
 
-    return df
+    return _prepare_for_merge(df)
 
 
 def fetch_recent_news(
@@ -214,88 +267,115 @@ def fetch_recent_news(
     - sorts newest first
     Returns DataFrame with:
     [date, source, title, url, description, pid, provider, title_norm]
+
+    Results are reused for NEWS_CACHE_TTL seconds per (company, ticker, days, limit);
+    callers always get their own copy.
     """
+    key = (company.strip().lower(), (ticker or "").upper(), days, limit)
+    now = time.time()
+
+    if is_cache_enabled():
+        with _news_cache_lock:
+            hit = _news_cache.get(key)
+        if hit and now - hit[0] < NEWS_CACHE_TTL:
+            logger.info(f"News cache hit for {company} ({ticker})")
+            return hit[1].copy()
+
+    out = _fetch_recent_news_uncached(company, ticker, days, limit)
+
+    if is_cache_enabled() and not out.empty:
+        with _news_cache_lock:
+            if len(_news_cache) >= _NEWS_CACHE_MAX:
+                # drop expired entries first, then the oldest if still full
+                for k in [k for k, (ts, _) in _news_cache.items() if now - ts >= NEWS_CACHE_TTL]:
+                    del _news_cache[k]
+                if len(_news_cache) >= _NEWS_CACHE_MAX:
+                    del _news_cache[min(_news_cache, key=lambda k: _news_cache[k][0])]
+            _news_cache[key] = (now, out.copy())
+
+    return out
+
+
+def _fetch_recent_news_uncached(
+    company: str,
+    ticker: str,
+    days: int,
+    limit: int
+) -> pd.DataFrame:
+    """Provider fan-out, merge and dedupe behind fetch_recent_news()."""
+
+    # one clock read for the whole run: provider date windows and the
+    # recency cutoff all use the same "now"
+    now = datetime.now(timezone.utc)
 
     frames = []
     providers_succeeded = []
     providers_failed = []
 
-    # Polygon
-    try:
-        logger.info(f"Fetching from Polygon.io (ticker={ticker})")
-        poly_df = fetch_polygon(ticker, limit)
-        if not poly_df.empty:
-            frames.append(poly_df)
-            providers_succeeded.append(f"Polygon ({len(poly_df)} articles)")
-            logger.info(f"Polygon: Retrieved {len(poly_df)} articles")
-        else:
-            logger.info("Polygon: No articles returned")
-    except Exception as e:
-        providers_failed.append(f"Polygon: {e}")
-        logger.warning(f"Polygon failed: {e}")
-
-    # Finnhub
-    try:
-        logger.info(f"Fetching from Finnhub (ticker={ticker}, days={days})")
-        fin_df = fetch_finnhub(ticker, days, limit)
-        if not fin_df.empty:
-            frames.append(fin_df)
-            providers_succeeded.append(f"Finnhub ({len(fin_df)} articles)")
-            logger.info(f"Finnhub: Retrieved {len(fin_df)} articles")
-        else:
-            logger.info("Finnhub: No articles returned")
-    except Exception as e:
-        providers_failed.append(f"Finnhub: {e}")
-        logger.warning(f"Finnhub failed: {e}")
-
-    # NewsAPI
-    try:
-        logger.info(f"Fetching from NewsAPI (company={company}, days={days})")
-        news_df = fetch_newsapi(company, ticker, days, limit)
-        if not news_df.empty:
-            frames.append(news_df)
-            providers_succeeded.append(f"NewsAPI ({len(news_df)} articles)")
-            logger.info(f"NewsAPI: Retrieved {len(news_df)} articles")
+    # Providers are independent network calls, so run them side by side.
+    # Results are merged in a fixed order so dedupe keeps the same winner.
+    providers = {
+        "Polygon": (fetch_polygon, (ticker, limit)),
+        "Finnhub": (fetch_finnhub, (ticker, days, limit, now)),
+        "NewsAPI": (fetch_newsapi, (company, ticker, days, limit, now)),
+    }
+    results: Dict[str, pd.DataFrame] = {}
+
+    logger.info(f"Fetching from Polygon.io, Finnhub, NewsAPI (company={company}, ticker={ticker}, days={days})")
+
+    with ThreadPoolExecutor(max_workers=len(providers)) as ex:
+        futures = {
+            ex.submit(func, *args): name
+            for name, (func, args) in providers.items()
+        }
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                results[name] = fut.result()
+            except Exception as e:
+                providers_failed.append(f"{name}: {e}")
+                logger.warning(f"{name} failed: {e}")
+
+    for name in providers:
+        df = results.get(name)
+        if df is None:
+            continue
+        if not df.empty:
+            frames.append(df)
+            providers_succeeded.append(f"{name} ({len(df)} articles)")
+            logger.info(f"{name}: Retrieved {len(df)} articles")
         else:
-            logger.info("NewsAPI: No articles returned")
-    except Exception as e:
-        providers_failed.append(f"NewsAPI: {e}")
-        logger.warning(f"NewsAPI failed: {e}")
+            logger.info(f"{name}: No articles returned")
 
     if not frames:
-        return pd.DataFrame(
-            columns=[
-                "date",
-                "source",
-                "title",
-                "url",
-                "description",
-                "pid",
-                "provider",
-                "title_norm",
-            ]
-        )
-
-    out = pd.concat(frames, ignore_index=True)
+        return _EMPTY_NEWS.copy()
 
-    # align Polygon freshness with the same `days` window
-    out = drop_older_than(out, days)
+    out = to_arrow_strings(pd.concat(frames, ignore_index=True, copy=False), TEXT_COLUMNS)
+    out = out.astype({c: "category" for c in CATEGORY_COLUMNS if c in out.columns})
 
-    out["title_norm"] = out["title"].apply(norm_title)
+    # align Polygon freshness with the same `days` window
+    out = drop_older_than(out, days, now=now)
 
-    # Deduplicate
-    # 1. provider's own ID
-    out = out.drop_duplicates(subset=["pid"], keep="first")
+    # Deduplicate; each pass only sees the survivors of the previous one
+    # 1. provider's own ID (rows without one are left to the later passes)
+    dup_pid = out["pid"].duplicated(keep="first") & out["pid"].notna()
+    out = out[~dup_pid.to_numpy()]
     # 2. same (normalized title + source)
     out = out.drop_duplicates(subset=["title_norm", "source"], keep="first")
     # 3. same URL
     out = out.drop_duplicates(subset=["url"], keep="first")
 
-    out = (
-        out.sort_values("date", ascending=False)
-        .head(limit)
-        .reset_index(drop=True)
-    )
+    # newest `limit` rows via a partial sort (heap) rather than a full sort
+    out = out.nlargest(limit, "date").reset_index(drop=True)
+    # callers get plain strings back (row.get("source") or "" must work):
+    # casting a categorical to object leaves NaN for missing values, so
+    # restore None explicitly (to_object_strings is a no-op without pyarrow)
+    for c in CATEGORY_COLUMNS:
+        if c in out.columns:
+            col = out[c].astype(object)
+            col[col.isna()] = None
+            out[c] = col
+    out = to_object_strings(out, TEXT_COLUMNS)
 
     logger.info(
         f"Fetch complete: {len(out)} articles after deduplication and filtering. "
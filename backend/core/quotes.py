@@ -11,10 +11,72 @@ Pipeline position:
                             [summarize.py] (separate branch)
 """
 
-import re
+import hashlib
 import json
-from typing import List, Dict, Any
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set
 from utils.config import GEMINI
+from utils.cache import DiskCache
+from utils.utils import extract_json_block
+
+# Parsed quote lists keyed by a hash of the exact prompt (same articles,
+# company and count => same request)
+_QUOTE_CACHE = DiskCache("quote_extraction", ttl=24 * 3600)
+
+# Large article sets are split into chunks of this many articles, extracted
+# by parallel Gemini calls and merged by weight
+QUOTE_CHUNK_ARTICLES = 6
+MAX_QUOTE_WORKERS = 5
+
+# What to extract and how to score it
+_QUOTE_CRITERIA = """PRIORITIZE (in order):
+1. Earnings guidance, revenue forecasts, financial targets
+2. CEO/CFO statements about performance or strategy
+3. Analyst price targets, rating changes, strong opinions
+4. Major announcements (M&A, products, market expansion)
+5. Competitive positioning, market share data
+6. Risk factors, regulatory concerns
+
+For each quote, provide:
+- quote: The EXACT text from the article (verbatim, in quotes)
+- speaker: Name and role/title (e.g., "Tim Cook, CEO" or "Unknown")
+- weight: Importance score 0.0 to 1.0
+  * 0.9-1.0 = CRITICAL (direct guidance, major strategy shifts, analyst upgrades/downgrades)
+  * 0.7-0.8 = HIGH (executive performance commentary, competitive insights)
+  * 0.5-0.6 = MODERATE (business updates, product details)
+  * 0.3-0.4 = LOW (background, general industry trends)
+- context: One sentence (10-20 words) explaining why this matters to investors
+"""
+
+# Fixed head of every single-company quote prompt; only the company, quote
+# count and articles are appended per call
+_QUOTE_INSTRUCTIONS = """You are analyzing financial news articles about a company.
+
+Your task: Extract the MOST IMPORTANT quotes across ALL articles for investment decision-making.
+
+""" + _QUOTE_CRITERIA + """- article_index: The [ARTICLE N] number where this quote appears (the N from its header)
+
+Return ONLY valid JSON (no markdown, no extra text):
+{
+  "quotes": [
+    {
+      "quote": "exact quote text",
+      "speaker": "Name and Role",
+      "weight": 0.85,
+      "context": "brief explanation",
+      "article_index": 0
+    }
+  ]
+}
+"""
+
+# Final quotes per (company, article set), reused when a later run's articles
+# mostly overlap (>= QUOTE_SET_OVERLAP Jaccard on URLs)
+_QUOTE_SET_CACHE = DiskCache("quote_sets", ttl=6 * 3600)
+QUOTE_SET_OVERLAP = 0.8
+# Recent article sets remembered per company for the overlap lookup
+_MAX_RECENT_SETS = 8
 
 
 def extract_quotes_from_articles(articles: List[Dict[str, Any]], company_name: str, num_quotes: int = 15) -> List[Dict[str, Any]]:
@@ -55,6 +117,11 @@ def extract_quotes_from_articles(articles: List[Dict[str, Any]], company_name: s
     # Validate and clamp num_quotes
     num_quotes = max(10, min(20, num_quotes))
 
+    # A recent run over (nearly) the same articles already has the answer
+    similar = _load_similar_quote_set(company_name, articles[:30], num_quotes)
+    if similar:
+        return similar[:num_quotes]
+
     # Prepare articles for LLM analysis (limit to avoid token overflow)
     article_data = _prepare_articles_for_analysis(articles[:30])
 
@@ -62,7 +129,7 @@ def extract_quotes_from_articles(articles: List[Dict[str, Any]], company_name: s
         return []
 
     # Use LLM to extract quotes with weights
-    raw_quotes = _llm_extract_quotes(article_data, company_name, num_quotes)
+    raw_quotes = _extract_quotes_chunked(article_data, company_name, num_quotes)
 
     if not raw_quotes:
         return []
@@ -70,9 +137,104 @@ def extract_quotes_from_articles(articles: List[Dict[str, Any]], company_name: s
     # Attach article metadata to quotes
     quotes = _attach_metadata(raw_quotes, articles)
 
+    _store_quote_set(company_name, articles[:30], quotes, num_quotes)
+
     return quotes
 
 
+def _load_similar_quote_set(
+    company_name: str,
+    articles: List[Dict[str, Any]],
+    num_quotes: int
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Find cached quotes for a recent article set that overlaps this one.
+
+    Cached quotes store only their article URL; metadata is re-attached from
+    the current articles, and quotes from articles no longer present are
+    dropped. A set extracted for fewer quotes than num_quotes is only reused
+    if it still holds at least num_quotes of them.
+
+    Returns:
+        Quotes in extract_quotes_from_articles() format, or None if no recent
+        set reaches QUOTE_SET_OVERLAP
+    """
+    by_url = {a["url"]: a for a in articles if a.get("url")}
+    if not by_url:
+        return None
+
+    current = set(by_url)
+    recent = _QUOTE_SET_CACHE.get(f"recent|{company_name.strip().lower()}") or []
+
+    for set_hash, cached_urls in recent:
+        cached_urls = set(cached_urls)
+        overlap = len(current & cached_urls) / len(current | cached_urls)
+        if overlap < QUOTE_SET_OVERLAP:
+            continue
+        cached = _QUOTE_SET_CACHE.get(set_hash)
+        # sets cached before the requested count was stored are bare lists
+        if not isinstance(cached, dict):
+            continue
+        if cached["num_quotes"] < num_quotes and len(cached["quotes"]) < num_quotes:
+            continue
+
+        quotes = []
+        for q in cached["quotes"]:
+            article = by_url.get(q["url"])
+            if article is None:
+                continue
+            quotes.append({
+                "quote": q["quote"],
+                "speaker": q["speaker"],
+                "weight": q["weight"],
+                "context": q["context"],
+                "source_article": {
+                    "title": article.get("title", ""),
+                    "source": article.get("source", ""),
+                    "url": article.get("url", ""),
+                    "date": article.get("date")
+                }
+            })
+        return quotes
+
+    return None
+
+
+def _store_quote_set(
+    company_name: str,
+    articles: List[Dict[str, Any]],
+    quotes: List[Dict[str, Any]],
+    num_quotes: int
+) -> None:
+    """Remember quotes (extracted for num_quotes) for this article set and add it to the company's recent sets."""
+    urls = sorted({a["url"] for a in articles if a.get("url")})
+    if not urls or not quotes:
+        return
+
+    company_key = company_name.strip().lower()
+    set_hash = hashlib.sha256("|".join([company_key] + urls).encode("utf-8")).hexdigest()
+    # dates are not JSON-serializable and metadata is re-attached on load,
+    # so only the quote fields and the article URL are stored
+    _QUOTE_SET_CACHE.set(set_hash, {
+        "num_quotes": num_quotes,
+        "quotes": [
+            {
+                "quote": q["quote"],
+                "speaker": q["speaker"],
+                "weight": q["weight"],
+                "context": q["context"],
+                "url": q["source_article"].get("url", ""),
+            }
+            for q in quotes
+        ],
+    })
+
+    recent_key = f"recent|{company_key}"
+    recent = [entry for entry in (_QUOTE_SET_CACHE.get(recent_key) or []) if entry[0] != set_hash]
+    recent.insert(0, [set_hash, urls])
+    _QUOTE_SET_CACHE.set(recent_key, recent[:_MAX_RECENT_SETS])
+
+
 def _prepare_articles_for_analysis(articles: List[Dict[str, Any]]) -> List[Dict[str, str]]:
     """
     Prepare articles for LLM processing by extracting key fields and truncating text.
@@ -108,6 +270,52 @@ def _prepare_articles_for_analysis(articles: List[Dict[str, Any]]) -> List[Dict[
     return prepared
 
 
+def _format_articles(article_data: List[Dict[str, str]]) -> str:
+    """Render prepared articles as [ARTICLE N] blocks for a quote prompt."""
+    parts = []
+    for art in article_data:
+        parts.append(
+            f"\n[ARTICLE {art['index']}]\n"
+            f"Title: {art['title']}\n"
+            f"Source: {art['source']}\n"
+            f"Text: {art['text']}\n"
+            "---\n"
+        )
+    return "".join(parts)
+
+
+def _extract_quotes_chunked(article_data: List[Dict[str, str]], company_name: str, num_quotes: int) -> List[Dict[str, Any]]:
+    """
+    Extract quotes from article chunks in parallel, then keep the top ones.
+
+    Up to QUOTE_CHUNK_ARTICLES articles need just one call. Larger sets are
+    split into chunks sent to Gemini concurrently (MAX_QUOTE_WORKERS), so
+    latency follows the slowest chunk instead of one huge prompt. Each chunk
+    is asked for a share of candidates proportional to its size (at least 5,
+    about twice its share); candidates are merged by weight.
+
+    Returns:
+        Up to num_quotes raw quotes sorted by weight (highest first)
+    """
+    if len(article_data) <= QUOTE_CHUNK_ARTICLES:
+        return _llm_extract_quotes(article_data, company_name, num_quotes)
+
+    chunks = [
+        article_data[i:i + QUOTE_CHUNK_ARTICLES]
+        for i in range(0, len(article_data), QUOTE_CHUNK_ARTICLES)
+    ]
+
+    def extract_chunk(chunk: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        quota = min(num_quotes, max(5, math.ceil(2 * num_quotes * len(chunk) / len(article_data))))
+        return _llm_extract_quotes(chunk, company_name, quota)
+
+    with ThreadPoolExecutor(max_workers=min(MAX_QUOTE_WORKERS, len(chunks))) as pool:
+        candidates = [q for quotes in pool.map(extract_chunk, chunks) for q in quotes]
+
+    candidates.sort(key=lambda x: x["weight"], reverse=True)
+    return candidates[:num_quotes]
+
+
 def _llm_extract_quotes(article_data: List[Dict[str, str]], company_name: str, num_quotes: int) -> List[Dict[str, Any]]:
     """
     Use LLM to extract the most important quotes across all articles.
@@ -121,54 +329,22 @@ def _llm_extract_quotes(article_data: List[Dict[str, str]], company_name: str, n
         List of raw quote dictionaries with quote, speaker, weight, context, article_index
     """
     # Build prompt with all articles
-    articles_text = ""
-    for art in article_data:
-        articles_text += f"\n[ARTICLE {art['index']}]\n"
-        articles_text += f"Title: {art['title']}\n"
-        articles_text += f"Source: {art['source']}\n"
-        articles_text += f"Text: {art['text']}\n"
-        articles_text += "---\n"
-
-    prompt = f"""You are analyzing {len(article_data)} financial news articles about {company_name}.
-
-{articles_text}
-
-Your task: Extract the {num_quotes} MOST IMPORTANT quotes across ALL articles for investment decision-making.
-
-PRIORITIZE (in order):
-1. Earnings guidance, revenue forecasts, financial targets
-2. CEO/CFO statements about performance or strategy
-3. Analyst price targets, rating changes, strong opinions
-4. Major announcements (M&A, products, market expansion)
-5. Competitive positioning, market share data
-6. Risk factors, regulatory concerns
-
-For each quote, provide:
-- quote: The EXACT text from the article (verbatim, in quotes)
-- speaker: Name and role/title (e.g., "Tim Cook, CEO" or "Unknown")
-- weight: Importance score 0.0 to 1.0
-  * 0.9-1.0 = CRITICAL (direct guidance, major strategy shifts, analyst upgrades/downgrades)
-  * 0.7-0.8 = HIGH (executive performance commentary, competitive insights)
-  * 0.5-0.6 = MODERATE (business updates, product details)
-  * 0.3-0.4 = LOW (background, general industry trends)
-- context: One sentence (10-20 words) explaining why this matters to investors
-- article_index: The [ARTICLE N] number where this quote appears (0-{len(article_data)-1})
-
-Return ONLY valid JSON (no markdown, no extra text):
-{{
-  "quotes": [
-    {{
-      "quote": "exact quote text",
-      "speaker": "Name and Role",
-      "weight": 0.85,
-      "context": "brief explanation",
-      "article_index": 0
-    }}
-  ]
-}}
-
-Extract exactly {num_quotes} quotes (or fewer if not enough quality quotes exist).
-"""
+    articles_text = _format_articles(article_data)
+
+    # Static instructions first, per-call details and articles last, so the
+    # prompt prefix is identical on every call (model-side prefix caching)
+    prompt = (
+        _QUOTE_INSTRUCTIONS
+        + f"\nCompany: {company_name}\n"
+        + f"Extract exactly {num_quotes} quotes (or fewer if not enough quality quotes exist) "
+        + f"across ALL {len(article_data)} articles below.\n"
+        + articles_text
+    )
+
+    cache_key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    cached = _QUOTE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
     try:
         # Call Gemini LLM
@@ -176,61 +352,85 @@ Extract exactly {num_quotes} quotes (or fewer if not enough quality quotes exist
         response_text = response.text.strip()
 
         # Extract JSON (consistent with project pattern)
-        match = re.search(r"\{.*\}", response_text, re.S)
-        if not match:
+        block = extract_json_block(response_text)
+        if not block:
             return []
 
-        data = json.loads(match.group(0))
+        data = json.loads(block)
 
         # Validate structure
         if "quotes" not in data or not isinstance(data["quotes"], list):
             return []
 
-        # Validate and clean each quote
-        validated_quotes = []
-        for q in data["quotes"]:
-            # Check required fields
-            required = ["quote", "speaker", "weight", "context", "article_index"]
-            if not all(k in q for k in required):
-                continue
+        validated_quotes = _validate_quotes(data["quotes"], {art["index"] for art in article_data})
 
-            # Validate weight range
-            try:
-                weight = float(q["weight"])
-                if weight < 0 or weight > 1:
-                    continue
-            except (ValueError, TypeError):
-                continue
+        # Store the parsed list so a hit also skips JSON parsing/validation;
+        # an empty list is not cached so a bad response is retried next time
+        if validated_quotes:
+            _QUOTE_CACHE.set(cache_key, validated_quotes)
 
-            # Validate article index
-            try:
-                article_idx = int(q["article_index"])
-                if article_idx < 0 or article_idx >= len(article_data):
-                    continue
-            except (ValueError, TypeError):
+        return validated_quotes
+
+    except Exception:
+        # Fail-closed: return empty list on any error
+        return []
+
+
+def _validate_quotes(quotes: List[Any], valid_indices: Set[int]) -> List[Dict[str, Any]]:
+    """
+    Validate and clean raw quote objects from the LLM.
+
+    Drops entries with missing fields, out-of-range weights or article
+    indices, or very short quote text.
+
+    Args:
+        quotes: Raw "quotes" list from the model response
+        valid_indices: [ARTICLE N] numbers that were in the prompt
+
+    Returns:
+        Cleaned quote dicts sorted by weight (highest first)
+    """
+    # Validate and clean each quote
+    validated_quotes = []
+    for q in quotes:
+        # Check required fields
+        required = ["quote", "speaker", "weight", "context", "article_index"]
+        if not all(k in q for k in required):
+            continue
+
+        # Validate weight range
+        try:
+            weight = float(q["weight"])
+            if weight < 0 or weight > 1:
                 continue
+        except (ValueError, TypeError):
+            continue
 
-            # Clean and validate quote text
-            quote_text = str(q["quote"]).strip()
-            if len(quote_text) < 15:  # Skip very short quotes
+        # Validate article index
+        try:
+            article_idx = int(q["article_index"])
+            if article_idx not in valid_indices:
                 continue
+        except (ValueError, TypeError):
+            continue
 
-            validated_quotes.append({
-                "quote": quote_text,
-                "speaker": str(q["speaker"]).strip(),
-                "weight": round(weight, 2),
-                "context": str(q["context"]).strip(),
-                "article_index": article_idx
-            })
+        # Clean and validate quote text
+        quote_text = str(q["quote"]).strip()
+        if len(quote_text) < 15:  # Skip very short quotes
+            continue
 
-        # Sort by weight (highest first)
-        validated_quotes.sort(key=lambda x: x["weight"], reverse=True)
+        validated_quotes.append({
+            "quote": quote_text,
+            "speaker": str(q["speaker"]).strip(),
+            "weight": round(weight, 2),
+            "context": str(q["context"]).strip(),
+            "article_index": article_idx
+        })
 
-        return validated_quotes
+    # Sort by weight (highest first)
+    validated_quotes.sort(key=lambda x: x["weight"], reverse=True)
 
-    except Exception:
-        # Fail-closed: return empty list on any error
-        return []
+    return validated_quotes
 
 
 def _attach_metadata(raw_quotes: List[Dict[str, Any]], original_articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
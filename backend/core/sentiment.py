@@ -1,22 +1,125 @@
-from transformers import pipeline
+import functools
+import logging
+import os
+
+import numpy as np
+import torch
+from transformers import AutoTokenizer, pipeline
+
+from utils.config import SENTIMENT_BACKEND, SENTIMENT_QUANTIZE, MODEL_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment"
+BATCH_SIZE = 32
+ONNX_MODEL_DIR = os.path.join(MODEL_CACHE_DIR, "sentiment-onnx")
+ONNX_INT8_FILE = "model_quantized.onnx"
 
 label_map = {
     "LABEL_0": "negative",
     "LABEL_1": "neutral",
     "LABEL_2": "positive"
 }
+# Column index of each raw label in the (num_sentences, 3) score matrix
+_LABEL_INDEX = {label: i for i, label in enumerate(label_map)}
+_NEG, _POS = _LABEL_INDEX["LABEL_0"], _LABEL_INDEX["LABEL_2"]
+
+
+def _load_onnx_pipeline():
+    """
+    Build the pipeline on ONNX Runtime (fused kernels, faster CPU inference).
+
+    The ONNX export (and int8 quantization, if enabled) runs once and is
+    saved under ONNX_MODEL_DIR; later loads read the exported graph directly.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    if not os.path.isdir(ONNX_MODEL_DIR):
+        logger.info(f"Exporting {MODEL_NAME} to ONNX (one-time) -> {ONNX_MODEL_DIR}")
+        model = ORTModelForSequenceClassification.from_pretrained(MODEL_NAME, export=True)
+        model.save_pretrained(ONNX_MODEL_DIR)
+
+    if SENTIMENT_QUANTIZE:
+        if not os.path.isfile(os.path.join(ONNX_MODEL_DIR, ONNX_INT8_FILE)):
+            from optimum.onnxruntime import ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+            logger.info("Quantizing ONNX sentiment model to int8 (one-time)")
+            quantizer = ORTQuantizer.from_pretrained(ONNX_MODEL_DIR)
+            quantizer.quantize(
+                save_dir=ONNX_MODEL_DIR,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False),
+            )
+        model = ORTModelForSequenceClassification.from_pretrained(ONNX_MODEL_DIR, file_name=ONNX_INT8_FILE)
+    else:
+        model = ORTModelForSequenceClassification.from_pretrained(ONNX_MODEL_DIR)
+
+    return pipeline(
+        "sentiment-analysis",
+        model=model,
+        tokenizer=AutoTokenizer.from_pretrained(MODEL_NAME),
+        top_k=None,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_sentiment_model():
+    """
+    Load the sentiment pipeline on first use and reuse it afterwards.
+
+    Deferring the load keeps server startup fast; on a CUDA machine the model
+    runs in half precision on the GPU. On CPU the Linear layers can be int8
+    quantized (opt-in via SENTIMENT_QUANTIZE), and with SENTIMENT_BACKEND=onnx inference
+    uses ONNX Runtime instead of eager PyTorch.
+    """
+    use_cuda = torch.cuda.is_available()
+
+    if SENTIMENT_BACKEND == "onnx" and not use_cuda:
+        try:
+            return _load_onnx_pipeline()
+        except ImportError:
+            logger.warning("SENTIMENT_BACKEND=onnx but optimum[onnxruntime] is not installed; using PyTorch")
+        except Exception as e:
+            logger.warning(f"ONNX sentiment model failed to load ({e}); using PyTorch")
+
+    sentiment_pipe = pipeline(
+        "sentiment-analysis",
+        model=MODEL_NAME,
+        tokenizer=MODEL_NAME,
+        top_k=None,
+        device=0 if use_cuda else -1,
+        torch_dtype=torch.float16 if use_cuda else None,
+    )
+
+    if use_cuda:
+        # TF32 matmuls on Ampere+ for any op that stays in fp32
+        torch.backends.cuda.matmul.allow_tf32 = True
+        try:
+            # fused attention kernels (optional, needs optimum)
+            sentiment_pipe.model = sentiment_pipe.model.to_bettertransformer()
+        except Exception as e:
+            logger.debug(f"BetterTransformer not applied ({e})")
+
+    if SENTIMENT_QUANTIZE and not use_cuda:
+        # int8 weights for the Linear layers: ~half the memory and faster
+        # matmuls on CPU, with negligible change to 3-class sentiment scores
+        try:
+            sentiment_pipe.model = torch.ao.quantization.quantize_dynamic(
+                sentiment_pipe.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        except Exception as e:
+            logger.warning(f"Dynamic quantization failed ({e}); using fp32 sentiment model")
+
+    return sentiment_pipe
 
-sentiment_model = pipeline(
-    "sentiment-analysis",
-    model="cardiffnlp/twitter-roberta-base-sentiment",
-    tokenizer="cardiffnlp/twitter-roberta-base-sentiment",
-    top_k=None
-)
 
 def get_sentiment_scores(sentences):
     """
     Analyze sentiment for a list of sentences.
 
+    All sentences go through the model in batched forward passes rather than
+    one call per sentence.
+
     Args:
         sentences: List of strings to analyze
 
@@ -24,19 +127,31 @@ def get_sentiment_scores(sentences):
         dict: Mapping of sentence -> sentiment score (positive - negative)
               Score ranges from -1.0 (very negative) to +1.0 (very positive)
     """
-    scores = {}
+    sentences = list(sentences)
+    if not sentences:
+        return {}
 
-    for sentence in sentences:
-        result = sentiment_model(sentence)[0]
+    sentiment_model = get_sentiment_model()
 
-        # Extract positive and negative scores
-        sentiment_dict = {}
-        for r in result:
-            label = label_map[r['label']]
-            sentiment_dict[label] = r['score']
+    # Wire stories repeat verbatim across outlets: run each distinct
+    # sentence through the model once and fan the score back out
+    unique = list(dict.fromkeys(sentences))
+
+    with torch.inference_mode():
+        # truncation keeps over-long inputs (e.g. whole quotes) within the
+        # model's 512-token window instead of erroring out mid-batch
+        results = sentiment_model(
+            unique,
+            batch_size=min(BATCH_SIZE, len(unique)),
+            truncation=True,
+        )
 
-        # Calculate net sentiment: positive - negative
-        net_score = sentiment_dict['positive'] - sentiment_dict['negative']
-        scores[sentence] = round(net_score, 4)
+    # Fill a (num_unique, 3) matrix by label id, then take
+    # positive - negative for every text in one vectorized step
+    probs = np.zeros((len(unique), len(_LABEL_INDEX)))
+    for row, result in zip(probs, results):
+        for r in result:
+            row[_LABEL_INDEX[r['label']]] = r['score']
 
-    return scores
+    net_scores = dict(zip(unique, np.round(probs[:, _POS] - probs[:, _NEG], 4).tolist()))
+    return {sentence: net_scores[sentence] for sentence in sentences}
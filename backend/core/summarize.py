@@ -1,18 +1,92 @@
-import json
-import re
 import logging
 from typing import List, Dict, Any
 
 from utils.config import GEMINI
+from utils.utils import load_json_block
 
 logger = logging.getLogger(__name__)
 
+# Cap on estimated tokens for the news items in the summary prompt (~4 chars/token)
+TOKEN_BUDGET = 12000
+CHARS_PER_TOKEN = 4
+# Items that would get less content than this once the budget runs low are dropped
+MIN_ITEM_CONTENT = 200
+
+_STANCES = frozenset({"Bullish", "Neutral", "Bearish"})
+
+# Static output-schema block appended to every summary prompt
+_SUMMARY_OUTPUT_SPEC = (
+    "\n\nReturn STRICT JSON with keys:\n"
+    '{\n'
+    '  "bullets": ["...", "..."],            # 4-6 concise investor bullets\n'
+    '  "long": "8-12 sentences narrative",   # one long paragraph allowed\n'
+    '  "stance": "Bullish|Neutral|Bearish",\n'
+    '  "score": 1-9,\n'
+    '  "reason": "one short reason"\n'
+    '}\n'
+    "No extra text, no markdown, just JSON."
+)
+
+
+def _prep_items(rows: List[Dict[str, Any]], max_items: int) -> List[Dict[str, str]]:
+    """
+    Build the {title, source, content} items sent to the summarizer.
+
+    Prefers a full-article excerpt over the short description, and keeps the
+    total within TOKEN_BUDGET: the item that crosses the budget is trimmed,
+    and building stops once there is no room for a useful excerpt.
+    """
+    items = []
+    append = items.append
+    chars_left = TOKEN_BUDGET * CHARS_PER_TOKEN
+
+    for r in rows[:max_items]:
+        get = r.get
+        full_text = get("full_text")
+        if full_text and len(full_text) > 100:
+            # Use first 3000 chars of full article for better context
+            content = full_text[:3000]
+        else:
+            # Fall back to short description
+            content = (get("description") or "")[:500]
+
+        title = (get("title") or "")[:300]
+        source = get("source") or ""
+
+        room = chars_left - len(title) - len(source)
+        if room < min(len(content), MIN_ITEM_CONTENT):
+            logger.info(f"Summary prompt token budget reached after {len(items)} items")
+            break
+        content = content[:room]
+        chars_left = room - len(content)
+
+        append({"title": title, "source": source, "content": content})
+
+    return items
+
+
+def _format_items(items: List[Dict[str, str]]) -> str:
+    """
+    Render items as plain newline-delimited text for the prompt.
+
+    Cheaper than JSON in tokens: no quoting/escaping or structural characters.
+    Newlines inside fields are flattened so each item keeps its two-line shape.
+    """
+    lines = []
+    for it in items:
+        source = it["source"].replace("\n", " ")
+        title = it["title"].replace("\n", " ")
+        content = it["content"].replace("\n", " ")
+        lines.append(f"- [{source}] {title}\n  {content}")
+    return "\n".join(lines)
+
 
 def summarize_and_score(
     company: str,
     ticker: str,
     goal: str,
-    rows: List[Dict[str, Any]]
+    rows: List[Dict[str, Any]],
+    max_items: int = 20
 ) -> Dict[str, Any]:
     """
     Generate investment summary and sentiment for a company based on news articles.
@@ -23,27 +97,13 @@ def summarize_and_score(
         goal: Investment timeframe ("short-term" or "long-term")
         rows: List of news article dicts with 'title', 'source', 'description'
               Optional: 'full_text' field with complete article content (preferred)
+        max_items: Number of leading rows to include in the prompt
 
     Returns:
         Dict with keys: bullets, long, stance, score, reason
     """
 
-    items = []
-    for r in rows[:20]:
-        # Use full article text if available, otherwise fall back to description
-        full_text = r.get("full_text")
-        if full_text and len(full_text) > 100:
-            # Use first 3000 chars of full article for better context
-            content = full_text[:3000]
-        else:
-            # Fall back to short description
-            content = (r.get("description") or "")[:500]
-
-        items.append({
-            "title": (r.get("title") or "")[:300],
-            "source": r.get("source") or "",
-            "content": content  # Can be full article excerpt or description
-        })
+    items = _prep_items(rows, max_items)
 
     if not items:
         logger.warning(f"No headlines provided for summarization of {company}")
@@ -61,31 +121,21 @@ def summarize_and_score(
         "You are an investment assistant.\n"
         f"Company: {company} ({ticker or 'unknown'})\n"
         f"User goal: {goal}  # short-term=days/weeks; long-term=6+ months\n\n"
-        "Recent items (JSON array of {title,source,content}):\n"
-        "Note: 'content' may include full article text or just a summary.\n"
-        + json.dumps(items, ensure_ascii=False, indent=2)
-        + "\n\nReturn STRICT JSON with keys:\n"
-        '{\n'
-        '  "bullets": ["...", "..."],            # 4-6 concise investor bullets\n'
-        '  "long": "8-12 sentences narrative",   # one long paragraph allowed\n'
-        '  "stance": "Bullish|Neutral|Bearish",\n'
-        '  "score": 1-9,\n'
-        '  "reason": "one short reason"\n'
-        '}\n'
-        "No extra text, no markdown, just JSON."
+        "Recent items (each: '- [source] title' then an indented content line):\n"
+        "Note: content may include full article text or just a summary.\n"
+        + _format_items(items)
+        + _SUMMARY_OUTPUT_SPEC
     )
 
     try:
         resp = GEMINI.generate_content(prompt)
         txt = (getattr(resp, "text", "") or "").strip()
 
-        m = re.search(r"\{.*\}\s*$", txt, re.S)
-        if not m:
+        data = load_json_block(txt)
+        if not isinstance(data, dict):
             logger.error("Summarizer did not return strict JSON")
             raise ValueError("Summarizer did not return strict JSON.")
 
-        data = json.loads(m.group(0))
-
         bullets = list(data.get("bullets") or [])
         longp = (data.get("long") or "").strip()
         stance = (data.get("stance") or "Neutral").capitalize()
@@ -99,7 +149,7 @@ def summarize_and_score(
         reason = (data.get("reason") or "").strip()
 
         # Validation
-        if stance not in {"Bullish", "Neutral", "Bearish"}:
+        if stance not in _STANCES:
             logger.error(f"Invalid stance: {stance}")
             raise ValueError(f"Summarizer stance invalid: {stance}")
 
@@ -128,10 +178,6 @@ def summarize_and_score(
             "reason": reason
         }
 
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON parsing error in summarizer: {e}")
-        raise ValueError(f"Summarizer returned invalid JSON: {e}")
-
     except Exception as e:
         logger.error(f"Error generating summary: {e}", exc_info=True)
         raise
\ No newline at end of file
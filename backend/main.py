@@ -1,10 +1,19 @@
+import argparse
+import io
 import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
 from core.cleaner import clean_company_and_ticker
 from core.news_providers import fetch_recent_news
-from core.llm_client import relevance_filter_batch
+from core.llm_client import iter_relevance_batches
 from core.article_fetcher import fetch_articles_batch
 from core.summarize import summarize_and_score
 from core.quotes import extract_quotes_from_articles, print_quotes, get_quote_stats
+from utils.cache import set_cache_enabled
+from utils.utils import drop_offtopic_headlines, norm_title
 
 # Configure logging
 logging.basicConfig(
@@ -16,9 +25,173 @@ logger = logging.getLogger(__name__)
 # Configuration constants
 DEFAULT_NEWS_DAYS = 5
 DEFAULT_NEWS_LIMIT = 60
-LLM_BATCH_SIZE = 10
+LLM_TOKEN_BUDGET = 3000  # estimated prompt tokens per relevance batch
 MAX_HEADLINES_FOR_SUMMARY = 20
 MAX_HEADLINES_TO_DISPLAY = 12
+NUM_QUOTES = 15
+
+
+def extract_quotes_and_summary(company: str, ticker: str, goal: str, rows_with_content: list):
+    """
+    Run quote extraction and summarization side by side.
+
+    Both steps read the same article rows and spend their time waiting on
+    Gemini, so overlapping them costs max(t_quotes, t_summary) instead of the sum.
+
+    Returns:
+        (quotes, summary) tuple
+    """
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        quotes_future = pool.submit(
+            extract_quotes_from_articles, rows_with_content, company, num_quotes=NUM_QUOTES
+        )
+        summary_future = pool.submit(
+            summarize_and_score, company, ticker, goal, rows_with_content,
+            max_items=MAX_HEADLINES_FOR_SUMMARY,
+        )
+        return quotes_future.result(), summary_future.result()
+
+
+def filter_and_fetch_articles(df, company: str, ticker: str):
+    """
+    LLM relevance filter with full-article fetching pipelined behind it.
+
+    Headlines with the same normalized title (the same story from several
+    outlets) are judged once and the decision is applied to every copy.
+    As soon as a relevance batch is decided, its kept headlines are handed to
+    a background worker that downloads the article bodies, so the slow
+    article fetch overlaps the remaining Gemini batches instead of starting
+    after all of them. Batches are fetched one at a time by a single worker;
+    fetch_articles_batch downloads each batch's articles concurrently.
+
+    Returns:
+        (filtered_df, rows_with_content) - rows_with_content follows filtered_df order
+    """
+    # One records materialization serves both the filter prompts and the
+    # fetcher input (both only read from the dicts)
+    rows = df.to_dict(orient="records")
+    keep_flags = [False] * len(rows)
+    fetch_futures = []
+
+    # Group row indices by normalized title; the first row of each group
+    # goes to the LLM on behalf of the whole group
+    groups = {}
+    for i, row in enumerate(rows):
+        key = row.get("title_norm") or norm_title(row.get("title"))
+        groups.setdefault(key, []).append(i)
+    members = list(groups.values())
+    unique_rows = [rows[idx[0]] for idx in members]
+    if len(unique_rows) < len(rows):
+        logger.info(f"Judging {len(unique_rows)} unique titles for {len(rows)} headlines")
+
+    with ThreadPoolExecutor(max_workers=1) as fetch_pool:
+        for start, flags in iter_relevance_batches(company, ticker, unique_rows, token_budget=LLM_TOKEN_BUDGET):
+            kept_idx = []
+            for group, keep in zip(members[start:start + len(flags)], flags):
+                if keep:
+                    kept_idx.extend(group)
+            for i in kept_idx:
+                keep_flags[i] = True
+            if kept_idx:
+                kept = [rows[i] for i in kept_idx]
+                fetch_futures.append((kept_idx, fetch_pool.submit(fetch_articles_batch, kept)))
+
+        # Copies of a title can sit anywhere in df, so put the fetched rows
+        # back into df order
+        fetched = {}
+        for kept_idx, future in fetch_futures:
+            fetched.update(zip(kept_idx, future.result()))
+        rows_with_content = [fetched[i] for i in sorted(fetched)]
+
+    logger.info(f"LLM relevance filter complete: {sum(keep_flags)}/{len(keep_flags)} headlines passed")
+    # boolean ndarray mask takes pandas' vectorized indexing path
+    mask = np.asarray(keep_flags, dtype=bool)
+    return df[mask].reset_index(drop=True), rows_with_content
+
+
+def _do_analysis(company: str, ticker: str, goal: str, progress=None) -> dict:
+    """
+    Shared pipeline behind run_cli() and run_analysis(): fetch news, LLM
+    relevance filter with article fetching, then quotes + summary.
+
+    Args:
+        company: Resolved company name
+        ticker: Resolved ticker symbol (may be empty)
+        goal: Investment timeframe - "short-term" or "long-term"
+        progress: Optional callable receiving user-facing status lines (the CLI passes print)
+
+    Returns:
+        Dictionary with:
+        {
+            "error": None | "no_news" | "no_relevant",
+            "df": filtered headlines DataFrame,
+            "quotes": list[dict],
+            "summary": dict,
+            "articles_fetched": int
+        }
+    """
+    say = progress or (lambda msg: None)
+    result = {"error": None, "df": None, "quotes": [], "summary": None, "articles_fetched": 0}
+
+    # Step 2: Fetch news
+    say(f"\n[2/5] Fetching recent news from providers (last {DEFAULT_NEWS_DAYS} days)...")
+    logger.info(f"Fetching news for {company} ({ticker})")
+
+    df = fetch_recent_news(company, ticker, days=DEFAULT_NEWS_DAYS, limit=DEFAULT_NEWS_LIMIT)
+
+    if df.empty:
+        logger.warning(f"No news found for {company}")
+        result["error"] = "no_news"
+        return result
+
+    say(f"✓ Found {len(df)} headlines from providers")
+    logger.info(f"Fetched {len(df)} headlines")
+
+    # Cheap keyword pre-filter so obvious noise never reaches Gemini
+    before = len(df)
+    df = drop_offtopic_headlines(df, company, ticker)
+    if len(df) < before:
+        logger.info(f"Keyword pre-filter dropped {before - len(df)} off-topic headlines")
+
+    if df.empty:
+        logger.warning("No headlines left after keyword pre-filter")
+        result["error"] = "no_relevant"
+        return result
+
+    # Step 3 + 3.5: LLM relevance filter (no company-name literal filter - AI
+    # evaluates every headline that doesn't explicitly cite the ticker), with
+    # full article content fetched as each batch is kept
+    say(f"\n[3/5] Applying AI relevance verification on {len(df)} headlines...")
+    say("      (Batched processing; full articles for relevant headlines are")
+    say("       fetched while later batches are verified, may take 20-30 seconds)")
+    logger.info(f"Starting LLM relevance filter for {len(df)} headlines")
+
+    df, rows_with_content = filter_and_fetch_articles(df, company, ticker)
+
+    if df.empty:
+        logger.warning("No headlines passed LLM filter")
+        result["error"] = "no_relevant"
+        return result
+
+    say(f"✓ {len(df)} headlines verified as relevant by AI")
+    logger.info(f"{len(df)} headlines after LLM filter")
+
+    # Count how many articles successfully fetched
+    articles_fetched = sum(bool(r.get('full_text')) for r in rows_with_content)
+    say(f"✓ Fetched full content for {articles_fetched}/{len(df)} articles")
+    logger.info(f"Successfully fetched {articles_fetched} full articles")
+
+    # Step 4: Extract key quotes and summarize + stance (run in parallel)
+    say("\n[4/5] Extracting key quotes and generating investment summary...")
+    logger.info("Extracting quotes and generating summary in parallel")
+
+    quotes, summary = extract_quotes_and_summary(company, ticker, goal, rows_with_content)
+    say(f"✓ Extracted {len(quotes)} key quotes" if quotes else "✓ No quotes extracted")
+    logger.info(f"Extracted {len(quotes)} quotes")
+
+    result.update(df=df, quotes=quotes, summary=summary, articles_fetched=articles_fetched)
+    return result
+
 
 def run_cli():
     """Main CLI entry point for the investment news aggregation tool."""
@@ -58,7 +231,7 @@ def run_cli():
                 validated_mark = "" if cand.get("validated", True) else " [UNVALIDATED]"
                 print(f"  [{i}] {cand['company']} ({cand['ticker']}){validated_mark}")
             print(f"  [{len(candidates)+1}] Enter ticker manually")
-            print(f"  [0] Cancel")
+            print("  [0] Cancel")
 
             while True:
                 try:
@@ -123,119 +296,79 @@ def run_cli():
         print(f"✓ Normalized: {company}" + (f" ({ticker})" if ticker else " (no ticker)"))
         logger.info(f"Resolved to: {company} ({ticker})")
 
-        # Step 2: Fetch news
-        print(f"\n[2/5] Fetching recent news from providers (last {DEFAULT_NEWS_DAYS} days)...")
-        logger.info(f"Fetching news for {company} ({ticker})")
+        result = _do_analysis(company, ticker, goal, progress=print)
 
-        df = fetch_recent_news(company, ticker, days=DEFAULT_NEWS_DAYS, limit=DEFAULT_NEWS_LIMIT)
-
-        if df.empty:
+        if result["error"] == "no_news":
             print("\nNo headlines found from any provider.")
             print("This could be due to:")
             print("  - Network connectivity issues")
             print("  - Missing or invalid API keys in .env file")
             print("  - No recent news for this company")
-            logger.warning(f"No news found for {company}")
             return
 
-        print(f"✓ Found {len(df)} headlines from providers")
-        logger.info(f"Fetched {len(df)} headlines")
-
-        # Step 3: LLM relevance filter (no literal filter - AI evaluates all headlines)
-        print(f"\n[3/5] Applying AI relevance verification on {len(df)} headlines...")
-        print("      (Using batched processing, may take 5-10 seconds)")
-        logger.info(f"Starting LLM relevance filter for {len(df)} headlines")
-
-        rows_for_filter = df[["title", "description"]].to_dict(orient="records")
-        keep_flags = relevance_filter_batch(company, ticker, rows_for_filter, batch_size=LLM_BATCH_SIZE)
-        df = df[keep_flags].reset_index(drop=True)
-
-        if df.empty:
+        if result["error"] == "no_relevant":
             print("\nNo relevant headlines after AI verification.")
             print("The AI determined none of the headlines were truly about this company.")
-            logger.warning("No headlines passed LLM filter")
             return
 
-        print(f"✓ {len(df)} headlines verified as relevant by AI")
-        logger.info(f"{len(df)} headlines after LLM filter")
-
-        # Step 3.5: Fetch full article content (NEW)
-        print(f"\n[3.5/5] Fetching full article content for deeper analysis...")
-        print(f"         (This may take 20-30 seconds for {len(df)} articles)")
-        logger.info(f"Fetching full article content for {len(df)} articles")
+        df = result["df"]
+        quotes = result["quotes"]
+        summary = result["summary"]
+        articles_fetched = result["articles_fetched"]
 
-        rows_with_content = fetch_articles_batch(df.to_dict(orient="records"))
-
-        # Count how many articles successfully fetched
-        articles_fetched = sum(1 for r in rows_with_content if r.get('full_text'))
-        print(f"✓ Fetched full content for {articles_fetched}/{len(df)} articles")
-        logger.info(f"Successfully fetched {articles_fetched} full articles")
-
-        # Step 4: Extract key quotes (second analysis branch)
-        print(f"\n[4/6] Extracting most important investment-relevant quotes...")
-        logger.info("Extracting quotes from articles")
-
-        quotes = extract_quotes_from_articles(rows_with_content, company, num_quotes=15)
-        print(f"✓ Extracted {len(quotes)} key quotes" if quotes else "✓ No quotes extracted")
-        logger.info(f"Extracted {len(quotes)} quotes")
-
-        # Step 5: Summarize + stance (parallel analysis branch)
-        print(f"\n[5/6] Generating investment summary with full article analysis...")
-        logger.info("Generating summary and sentiment")
-
-        summary = summarize_and_score(company, ticker, goal, rows_with_content)
-
-        print(f"\n[6/6] Analysis complete!")
+        print("\n[5/5] Analysis complete!")
         print(f"✓ Summary generated based on {articles_fetched} full articles")
 
-        # Pretty-print results
-        print("\n" + "="*60)
-        print("--- Investor Bullets ---")
+        # Pretty-print results into one buffer and write it in a single call
+        buf = io.StringIO()
+        print("\n" + "="*60, file=buf)
+        print("--- Investor Bullets ---", file=buf)
         for b in summary["bullets"]:
-            print(f"  • {b}")
+            print(f"  • {b}", file=buf)
 
-        print("\n--- Long Summary ---")
-        print(f"  {summary['long']}")
+        print("\n--- Long Summary ---", file=buf)
+        print(f"  {summary['long']}", file=buf)
 
-        print("\n--- Investment Sentiment ---")
-        print(f"  Stance: {summary['stance']} | Score: {summary['score']}/9")
-        print(f"  (1=very negative, 5=neutral, 9=very positive)")
+        print("\n--- Investment Sentiment ---", file=buf)
+        print(f"  Stance: {summary['stance']} | Score: {summary['score']}/9", file=buf)
+        print("  (1=very negative, 5=neutral, 9=very positive)", file=buf)
         if summary["reason"]:
-            print(f"  Reason: {summary['reason']}")
+            print(f"  Reason: {summary['reason']}", file=buf)
 
         # Display extracted quotes
         if quotes:
-            print("\n--- Key Investment Quotes ---")
+            print("\n--- Key Investment Quotes ---", file=buf)
             # Show top 8 quotes
             for i, q in enumerate(quotes[:8], 1):
                 weight_blocks = int(q["weight"] * 10)
                 weight_bar = "█" * weight_blocks + "░" * (10 - weight_blocks)
-                print(f"\n  {i}. [{weight_bar}] {q['weight']:.2f}")
-                print(f"     \"{q['quote']}\"")
-                print(f"     — {q['speaker']}")
-                print(f"     Why: {q['context']}")
+                print(f"\n  {i}. [{weight_bar}] {q['weight']:.2f}", file=buf)
+                print(f"     \"{q['quote']}\"", file=buf)
+                print(f"     — {q['speaker']}", file=buf)
+                print(f"     Why: {q['context']}", file=buf)
 
             # Show quote statistics
             stats = get_quote_stats(quotes)
-            print(f"\n  Stats: {stats['critical_count']} critical (≥0.9), {stats['high_count']} high priority (≥0.7)")
+            print(f"\n  Stats: {stats['critical_count']} critical (≥0.9), {stats['high_count']} high priority (≥0.7)", file=buf)
             if stats['top_speakers']:
-                print(f"  Most quoted: {', '.join(stats['top_speakers'][:2])}")
-
-        print("\n--- Relevant Headlines (newest first) ---")
-        show = df[["date", "source", "title", "url"]].copy()
-        try:
-            show["date"] = show["date"].dt.strftime("%Y-%m-%d %H:%M UTC")
-        except Exception as e:
-            logger.warning(f"Date formatting failed: {e}")
-            pass
-
-        for _, r in show.head(MAX_HEADLINES_TO_DISPLAY).iterrows():
-            print(f"\n  [{r['date']}] {r['source']}")
-            print(f"  {r['title']}")
-            print(f"  {r['url']}")
-
-        print("\n" + "="*60)
-        print("(Disclaimer: Informational only. This is NOT personalized investment advice.)")
+                print(f"  Most quoted: {', '.join(stats['top_speakers'][:2])}", file=buf)
+
+        print("\n--- Relevant Headlines (newest first) ---", file=buf)
+        show = df[["date", "source", "title", "url"]].head(MAX_HEADLINES_TO_DISPLAY)
+        for date, source, title, url in show.itertuples(index=False, name=None):
+            try:
+                date = date.strftime("%Y-%m-%d %H:%M UTC")
+            except Exception as e:
+                logger.warning(f"Date formatting failed: {e}")
+
+            print(f"\n  [{date}] {source}", file=buf)
+            print(f"  {title}", file=buf)
+            print(f"  {url}", file=buf)
+
+        print("\n" + "="*60, file=buf)
+        print("(Disclaimer: Informational only. This is NOT personalized investment advice.)", file=buf)
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
         logger.info("CLI execution completed successfully")
 
     except KeyboardInterrupt:
@@ -295,60 +428,38 @@ def run_analysis(company_name: str, goal: str = "short-term") -> dict:
 
         logger.info(f"Resolved to: {company} ({ticker})")
 
-        # Step 2: Fetch news
-        logger.info(f"Fetching news for {company} ({ticker})")
-        df = fetch_recent_news(company, ticker, days=DEFAULT_NEWS_DAYS, limit=DEFAULT_NEWS_LIMIT)
+        result = _do_analysis(company, ticker, goal)
 
-        if df.empty:
+        if result["error"] == "no_news":
             return {
                 "success": False,
                 "error": "No headlines found from any provider"
             }
 
-        logger.info(f"Fetched {len(df)} headlines")
-
-        # Step 3: LLM relevance filter
-        logger.info(f"Starting LLM relevance filter for {len(df)} headlines")
-        rows_for_filter = df[["title", "description"]].to_dict(orient="records")
-        keep_flags = relevance_filter_batch(company, ticker, rows_for_filter, batch_size=LLM_BATCH_SIZE)
-        df = df[keep_flags].reset_index(drop=True)
-
-        if df.empty:
+        if result["error"] == "no_relevant":
             return {
                 "success": False,
                 "error": "No relevant headlines after AI verification"
             }
 
-        logger.info(f"{len(df)} headlines after LLM filter")
-
-        # Step 4: Fetch full article content
-        logger.info(f"Fetching full article content for {len(df)} articles")
-        rows_with_content = fetch_articles_batch(df.to_dict(orient="records"))
-        articles_fetched = sum(1 for r in rows_with_content if r.get('full_text'))
-        logger.info(f"Successfully fetched {articles_fetched} full articles")
-
-        # Step 5: Extract key quotes
-        logger.info("Extracting quotes from articles")
-        quotes = extract_quotes_from_articles(rows_with_content, company, num_quotes=15)
-        logger.info(f"Extracted {len(quotes)} quotes")
-
-        # Step 6: Summarize + stance
-        logger.info("Generating summary and sentiment")
-        summary = summarize_and_score(company, ticker, goal, rows_with_content)
+        df = result["df"]
+        quotes = result["quotes"]
+        summary = result["summary"]
+        articles_fetched = result["articles_fetched"]
 
         # Format headlines for output
         headlines = []
-        for _, row in df.head(MAX_HEADLINES_TO_DISPLAY).iterrows():
+        for row in df.head(MAX_HEADLINES_TO_DISPLAY).itertuples(index=False):
             try:
-                date_str = row['date'].strftime("%Y-%m-%d %H:%M UTC")
+                date_str = row.date.strftime("%Y-%m-%d %H:%M UTC")
             except:
-                date_str = str(row['date'])
+                date_str = str(row.date)
 
             headlines.append({
                 "date": date_str,
-                "source": row['source'],
-                "title": row['title'],
-                "url": row['url']
+                "source": row.source,
+                "title": row.title,
+                "url": row.url
             })
 
         logger.info("Analysis completed successfully")
@@ -376,4 +487,15 @@ def run_analysis(company_name: str, goal: str = "short-term") -> dict:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TradeWise investment news analysis (CLI)")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached ticker resolutions/validations and query providers fresh",
+    )
+    args = parser.parse_args()
+
+    if args.no_cache:
+        set_cache_enabled(False)
+
     run_cli()
@@ -0,0 +1,8 @@
+"""Shared pytest setup: import backend modules the way the app does (core.*, utils.*)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# utils.config refuses to import without a key; these tests never call Gemini
+os.environ.setdefault("GEMINI_KEY", "test-key")
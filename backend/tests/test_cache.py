@@ -0,0 +1,82 @@
+"""Unit tests for utils.cache.DiskCache against a throwaway SQLite file."""
+import pytest
+
+from utils import cache
+from utils.cache import DiskCache
+
+
+@pytest.fixture(autouse=True)
+def temp_cache_db(tmp_path, monkeypatch):
+    """Point the shared connection at a fresh file for every test."""
+    monkeypatch.setattr(cache, "CACHE_PATH", str(tmp_path / "cache.db"))
+    monkeypatch.setattr(cache, "_conn", None)
+    yield
+    if cache._conn is not None:
+        cache._conn.close()
+    cache.set_cache_enabled(True)
+
+
+def test_round_trip_and_persistence():
+    DiskCache("ns", ttl=60).set("k", {"ticker": "AAPL", "n": [1, 2]})
+    # a new instance has an empty in-process layer, so this reads SQLite
+    assert DiskCache("ns", ttl=60).get("k") == {"ticker": "AAPL", "n": [1, 2]}
+
+
+def test_namespaces_are_separate():
+    DiskCache("a", ttl=60).set("k", 1)
+    assert DiskCache("b", ttl=60).get("k") is None
+
+
+def test_expired_entries_are_misses(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+
+    c = DiskCache("ns", ttl=10)
+    c.set("k", "v")
+    assert c.get("k") == "v"
+
+    now[0] += 10
+    assert c.get("k") is None
+    assert "k" not in c._memory
+    assert DiskCache("ns", ttl=10).get("k") is None
+
+
+def test_expired_rows_are_purged(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    monkeypatch.setattr(cache, "PURGE_EVERY_WRITES", 1)
+
+    c = DiskCache("ns", ttl=10)
+    c.set("old", 1)
+    now[0] += 20
+    c.set("new", 2)
+
+    keys = [row[0] for row in cache._get_conn().execute("SELECT key FROM cache WHERE namespace = 'ns'")]
+    assert keys == ["new"]
+
+
+def test_memory_layer_is_lru_bounded(monkeypatch):
+    monkeypatch.setattr(cache, "MEMORY_MAX_ENTRIES", 2)
+
+    c = DiskCache("ns", ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1  # "a" is now the most recently used
+    c.set("c", 3)
+
+    assert list(c._memory) == ["a", "c"]
+    # evicted entries are still served from SQLite
+    assert c.get("b") == 2
+
+
+def test_disabled_cache_neither_reads_nor_writes():
+    c = DiskCache("ns", ttl=60)
+    c.set("k", "before")
+
+    cache.set_cache_enabled(False)
+    assert not cache.is_cache_enabled()
+    assert c.get("k") is None
+    c.set("k", "while-disabled")
+
+    cache.set_cache_enabled(True)
+    assert c.get("k") == "before"
@@ -8,8 +8,9 @@ import os
 # Add parent directory to path to import Product modules
 
 
-import requests
-from core.article_fetcher import extract_article_text
+from concurrent.futures import ThreadPoolExecutor
+
+from core.article_fetcher import SESSION, extract_article_text
 
 # Example URLs from the logs with different char counts
 test_urls = {
@@ -19,10 +20,22 @@ test_urls = {
 
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
+HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml',
+}
+
 print("=" * 80)
 print("FINNHUB URL DIAGNOSTIC")
 print("=" * 80)
 
+# Fetch every URL at once; output below is still printed in test_urls order
+with ThreadPoolExecutor(max_workers=8) as pool:
+    futures = {
+        label: pool.submit(SESSION.get, url, headers=HEADERS, timeout=10, allow_redirects=True)
+        for label, url in test_urls.items()
+    }
+
 for label, url in test_urls.items():
     print(f"\n{'=' * 80}")
     print(f"Testing: {label.upper()}")
@@ -30,16 +43,8 @@ for label, url in test_urls.items():
     print("=" * 80)
 
     try:
-        # Fetch the URL
-        response = requests.get(
-            url,
-            headers={
-                'User-Agent': USER_AGENT,
-                'Accept': 'text/html,application/xhtml+xml',
-            },
-            timeout=10,
-            allow_redirects=True
-        )
+        # Collect the (already in-flight) response
+        response = futures[label].result()
 
         print(f"\nStatus Code: {response.status_code}")
         print(f"Content-Type: {response.headers.get('Content-Type', 'unknown')}")
@@ -0,0 +1,48 @@
+"""Unit tests for the LLM JSON extraction helpers in utils.utils."""
+from utils.utils import extract_json_block, load_json_block
+
+
+def test_extract_object_with_prose_and_fences():
+    text = 'Sure! ```json\n{"company": "Apple", "ticker": "AAPL"}\n``` Let me know.'
+    assert extract_json_block(text) == '{"company": "Apple", "ticker": "AAPL"}'
+
+
+def test_extract_nested_and_brackets_inside_strings():
+    text = 'x {"a": {"b": [1, {"c": "}"}]}, "d": "{not a brace"} trailing }'
+    assert extract_json_block(text) == '{"a": {"b": [1, {"c": "}"}]}, "d": "{not a brace"}'
+
+
+def test_extract_escaped_quote_in_string():
+    text = r'{"quote": "he said \"}\" loudly"} tail'
+    assert extract_json_block(text) == r'{"quote": "he said \"}\" loudly"}'
+
+
+def test_extract_array():
+    assert extract_json_block('Answer: ["YES", "NO"] done', "[") == '["YES", "NO"]'
+
+
+def test_extract_returns_first_balanced_block_even_if_not_json():
+    assert extract_json_block("Note [see below]: [1, 2]", "[") == "[see below]"
+
+
+def test_extract_missing_or_unbalanced():
+    assert extract_json_block("") is None
+    assert extract_json_block(None) is None
+    assert extract_json_block("no json here") is None
+    assert extract_json_block('{"a": {"b": 1}') is None
+
+
+def test_load_object_ignores_trailing_prose():
+    assert load_json_block('Here: {"quotes": []} hope that helps {') == {"quotes": []}
+
+
+def test_load_skips_non_json_bracket_before_the_real_block():
+    assert load_json_block("Note [see below]: [1, 2]", "[") == [1, 2]
+    assert load_json_block('{oops} {"ok": true}') == {"ok": True}
+
+
+def test_load_invalid_returns_none():
+    assert load_json_block("") is None
+    assert load_json_block("nothing") is None
+    assert load_json_block("{not: json}") is None
+    assert load_json_block('{"a": 1', "{") is None
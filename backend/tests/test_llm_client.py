@@ -0,0 +1,82 @@
+"""Unit tests for the batched relevance helpers in core.llm_client (no network)."""
+from core.llm_client import (
+    CHARS_PER_TOKEN,
+    MAX_ROWS_PER_BATCH,
+    ROW_OVERHEAD_TOKENS,
+    _parse_batch_answers,
+    _plan_batches,
+)
+
+
+def test_indexed_answers():
+    text = '[{"i": 1, "keep": true}, {"i": 2, "keep": false}, {"i": 3, "keep": "yes"}]'
+    assert _parse_batch_answers(text, 3) == [True, False, True]
+
+
+def test_indexed_answers_out_of_order():
+    text = '[{"i": 2, "keep": true}, {"i": 1, "keep": false}]'
+    assert _parse_batch_answers(text, 2) == [False, True]
+
+
+def test_positional_answers():
+    assert _parse_batch_answers('["YES", "NO", "yes"]', 3) == [True, False, True]
+
+
+def test_missing_index_fails_closed():
+    text = '[{"i": 1, "keep": true}, {"i": 3, "keep": true}]'
+    assert _parse_batch_answers(text, 3) == [True, None, True]
+
+
+def test_duplicate_index_leaves_other_headline_undecided():
+    text = '[{"i": 1, "keep": true}, {"i": 1, "keep": false}]'
+    assert _parse_batch_answers(text, 2) == [False, None]
+
+
+def test_bad_and_out_of_range_indices_are_ignored():
+    text = '[{"i": "x", "keep": true}, {"i": 0, "keep": true}, {"i": 9, "keep": true}, {"i": 2, "keep": true}]'
+    assert _parse_batch_answers(text, 2) == [None, True]
+
+
+def test_prose_around_the_array():
+    text = 'Note [see below]: [{"i": 1, "keep": true}] Hope this helps!'
+    assert _parse_batch_answers(text, 1) == [True]
+
+
+def test_unparseable_response_returns_none():
+    assert _parse_batch_answers("", 2) is None
+    assert _parse_batch_answers("I cannot help with that.", 2) is None
+    assert _parse_batch_answers('[{"i": 1, "keep": true}', 2) is None
+    assert _parse_batch_answers('{"i": 1, "keep": true}', 1) is None
+
+
+def _rows(n, title_chars=0):
+    return [{"title": "x" * title_chars, "description": None} for _ in range(n)]
+
+
+def test_plan_fixed_size_batches_without_budget():
+    assert _plan_batches(_rows(25), 10, None) == [(0, 10), (10, 20), (20, 25)]
+    assert _plan_batches([], 10, None) == []
+
+
+def test_plan_packs_rows_by_token_budget():
+    cost = 100 // CHARS_PER_TOKEN + ROW_OVERHEAD_TOKENS
+    spans = _plan_batches(_rows(7, title_chars=100), 10, token_budget=3 * cost)
+    assert spans == [(0, 3), (3, 6), (6, 7)]
+
+
+def test_plan_oversized_row_gets_its_own_batch():
+    rows = _rows(1) + _rows(1, title_chars=10_000) + _rows(1)
+    assert _plan_batches(rows, 10, token_budget=50) == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_plan_caps_rows_per_batch():
+    spans = _plan_batches(_rows(MAX_ROWS_PER_BATCH + 5), 10, token_budget=10**9)
+    assert spans == [(0, MAX_ROWS_PER_BATCH), (MAX_ROWS_PER_BATCH, MAX_ROWS_PER_BATCH + 5)]
+
+
+def test_plan_covers_every_row_once():
+    rows = [{"title": "t" * (i * 37 % 300), "description": "d" * (i * 53 % 500)} for i in range(123)]
+    spans = _plan_batches(rows, 10, token_budget=1500)
+    assert spans[0][0] == 0 and spans[-1][1] == len(rows)
+    assert all(a < b for a, b in spans)
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(spans, spans[1:]))
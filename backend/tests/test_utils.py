@@ -0,0 +1,77 @@
+"""Unit tests for the DataFrame helpers in utils.utils used by the news pipeline."""
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from utils.utils import drop_offtopic_headlines, drop_older_than, norm_title, norm_title_series
+
+
+def _titles(df: pd.DataFrame) -> list:
+    return df["title"].tolist()
+
+
+def test_offtopic_keywords_are_dropped():
+    df = pd.DataFrame({"title": [
+        "Apple beats earnings estimates",
+        "10 vegan recipes for Thanksgiving",
+        "Cooking tips for the holidays",
+        None,
+    ]})
+    # a missing title is not evidence of anything; later stages decide
+    assert _titles(drop_offtopic_headlines(df, "Apple Inc.", "AAPL")) == ["Apple beats earnings estimates", None]
+
+
+def test_company_names_that_look_offtopic_survive():
+    df = pd.DataFrame({"title": [
+        "Tim Cook says iPhone demand is strong",
+        "Campbell's Soup raises guidance",
+        "Pie Insurance raises new funding",
+    ]})
+    assert _titles(drop_offtopic_headlines(df)) == _titles(df)
+
+
+def test_company_or_ticker_titles_always_survive():
+    df = pd.DataFrame({"title": [
+        "Apple's new recipe for growth",
+        "AAPL cooking up a rally before Thanksgiving",
+        "Pineapple recipes",
+        "Vegan recipes",
+    ]})
+    out = drop_offtopic_headlines(df, "Apple Inc.", "AAPL")
+    assert _titles(out) == ["Apple's new recipe for growth", "AAPL cooking up a rally before Thanksgiving"]
+    assert list(out.index) == [0, 1]
+
+
+def test_offtopic_filter_handles_empty_and_titleless_frames():
+    empty = pd.DataFrame({"title": []})
+    assert drop_offtopic_headlines(empty, "Apple", "AAPL").empty
+    no_title = pd.DataFrame({"url": ["https://example.com"]})
+    assert drop_offtopic_headlines(no_title).equals(no_title)
+
+
+def test_norm_title_series_matches_norm_title():
+    titles = pd.Series(["  Apple  Beats\tEstimates ", "STRASSE Straße", None, "a\n\nb"])
+    assert norm_title_series(titles).tolist() == [norm_title(t) for t in titles]
+
+
+def test_drop_older_than_tz_aware_dates():
+    now = datetime(2025, 11, 10, 12, tzinfo=timezone.utc)
+    df = pd.DataFrame({
+        "title": ["new", "edge", "old", "missing"],
+        "date": pd.to_datetime([
+            now - timedelta(days=1),
+            now - timedelta(days=7),
+            now - timedelta(days=8),
+            None,
+        ], utc=True),
+    })
+    out = drop_older_than(df, 7, now=now)
+    assert _titles(out) == ["new", "edge"]
+    assert list(out.index) == [0, 1]
+
+
+def test_drop_older_than_without_dates_is_a_no_op():
+    df = pd.DataFrame({"title": ["a"]})
+    assert drop_older_than(df, 7) is df
+    empty = pd.DataFrame({"date": []})
+    assert drop_older_than(empty, 7) is empty
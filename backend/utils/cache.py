@@ -0,0 +1,151 @@
+"""
+Persistent key/value cache for slow lookups (LLM calls, ticker validation).
+
+Entries live in a single SQLite file so the cache survives restarts and can be
+shared between threads and processes. Values are stored as JSON. Each cache
+has a namespace and a TTL; expired entries are treated as misses.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from utils.config import CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+# Global switch (e.g. `python main.py --no-cache`)
+_enabled = True
+
+# In-process entries kept per cache (least recently used are evicted first)
+MEMORY_MAX_ENTRIES = 1024
+# Expired SQLite rows of a namespace are deleted every this many writes
+PURGE_EVERY_WRITES = 256
+
+_conn: Optional[sqlite3.Connection] = None
+_conn_lock = threading.Lock()
+
+
+def set_cache_enabled(enabled: bool) -> None:
+    """Turn all persistent caches on or off for this process."""
+    global _enabled
+    _enabled = enabled
+    logger.info(f"Persistent cache {'enabled' if enabled else 'disabled'}")
+
+
+def is_cache_enabled() -> bool:
+    """Whether caching is on for this process (see set_cache_enabled)."""
+    return _enabled
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Open the shared SQLite connection on first use."""
+    global _conn
+    if _conn is None:
+        conn = sqlite3.connect(CACHE_PATH, check_same_thread=False, timeout=5)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "namespace TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+class DiskCache:
+    """
+    Namespaced JSON cache with an in-process layer in front of SQLite.
+
+    Fail-open: any storage error is logged and treated as a cache miss, so a
+    broken cache file never breaks the pipeline. The in-process layer is an
+    LRU bounded by MEMORY_MAX_ENTRIES, and expired rows are purged from SQLite
+    periodically, so long-running servers do not grow without bound.
+    """
+
+    def __init__(self, namespace: str, ttl: float):
+        """
+        Args:
+            namespace: Logical cache name (keeps keys of different callers apart)
+            ttl: Time-to-live in seconds
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._writes = 0
+
+    def _remember(self, key: str, created_at: float, payload: str) -> None:
+        """Put an entry in the in-process LRU, evicting the oldest if full."""
+        with self._memory_lock:
+            self._memory[key] = (created_at, payload)
+            self._memory.move_to_end(key)
+            while len(self._memory) > MEMORY_MAX_ENTRIES:
+                self._memory.popitem(last=False)
+
+    def _purge_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete this namespace's expired rows (caller holds _conn_lock)."""
+        conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND created_at <= ?",
+            (self.namespace, now - self.ttl),
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on miss/expiry."""
+        if not _enabled:
+            return None
+
+        now = time.time()
+
+        with self._memory_lock:
+            hit = self._memory.get(key)
+            if hit:
+                if now - hit[0] < self.ttl:
+                    self._memory.move_to_end(key)
+                    return json.loads(hit[1])
+                del self._memory[key]
+
+        try:
+            with _conn_lock:
+                row = _get_conn().execute(
+                    "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache read failed ({self.namespace}): {e}")
+            return None
+
+        if not row or now - row[1] >= self.ttl:
+            return None
+
+        self._remember(key, row[1], row[0])
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key."""
+        if not _enabled:
+            return
+
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        self._remember(key, now, payload)
+
+        try:
+            with _conn_lock:
+                conn = _get_conn()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, payload, now),
+                )
+                if self._writes % PURGE_EVERY_WRITES == 0:
+                    self._purge_expired(conn, now)
+                self._writes += 1
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache write failed ({self.namespace}): {e}")
@@ -9,6 +9,16 @@ POLYGON_KEY = os.getenv("POLYGON_KEY")
 FINNHUB_KEY = os.getenv("FINNHUB_KEY")
 NEWS_KEY    = os.getenv("NEWS_KEY")
 
+# SQLite file for cached ticker resolutions / validations
+CACHE_PATH = os.getenv("TRADEWISE_CACHE_PATH", os.path.expanduser("~/.tradewise_cache.db"))
+
+# Sentiment model runtime: "torch" (default) or "onnx" (needs `optimum[onnxruntime]`)
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "torch").strip().lower()
+# int8 dynamic quantization of the sentiment model on CPU (opt-in: it shifts
+# scores slightly, and stance labels use tight +/-0.03 thresholds)
+SENTIMENT_QUANTIZE = os.getenv("SENTIMENT_QUANTIZE", "0") == "1"
+MODEL_CACHE_DIR = os.getenv("TRADEWISE_MODEL_CACHE", os.path.expanduser("~/.cache/tradewise"))
+
 if not GEMINI_KEY:
     raise RuntimeError("GEMINI_KEY missing. Add it to .env")
 
@@ -0,0 +1,76 @@
+"""
+Shared HTTP session helpers.
+
+A requests.Session keeps TCP/TLS connections alive between calls, so repeated
+requests to the same host skip the handshake. Sessions built here also retry
+transient gateway errors with a short backoff.
+"""
+import json
+from typing import Any, Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+
+def create_session(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    retries: int = 2,
+    backoff_factor: float = 0.3,
+    status_forcelist: Iterable[int] = (502, 503, 504),
+) -> requests.Session:
+    """
+    Build a pooled requests.Session with retry/backoff.
+
+    Args:
+        pool_connections: Number of per-host connection pools to keep
+        pool_maxsize: Max connections kept alive per host (>= worker threads)
+        retries: Retry attempts for connection errors / retryable statuses
+        backoff_factor: Exponential backoff base in seconds
+        status_forcelist: HTTP statuses that trigger a retry
+
+    Returns:
+        Configured requests.Session
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=tuple(status_forcelist),
+        allowed_methods=frozenset(["GET"]),
+        # hand the final response back so callers' status checks still apply
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate"})
+    return session
+
+
+def json_loads(payload: bytes) -> Any:
+    """Decode a JSON body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def response_json(response: requests.Response) -> Any:
+    """
+    Decode a response body as JSON.
+
+    Parses the raw bytes directly (orjson if available), skipping requests'
+    charset detection and text decoding on large provider payloads.
+    """
+    return json_loads(response.content)
@@ -1,29 +1,188 @@
+import json
 import re
+import numpy as np
 import pandas as pd
 from datetime import datetime, date, timedelta, timezone
-from typing import Union
+from typing import Any, List, Optional, Union
 
-def utc_today() -> date:
-    """Return today's date in UTC timezone."""
-    return datetime.now(timezone.utc).date()
+try:
+    import pyarrow  # noqa: F401
+    _ARROW_STRING = "string[pyarrow]"
+except ImportError:  # optional: fall back to plain object columns
+    _ARROW_STRING = None
+
+_WS_RE = re.compile(r"\s+")
+_BRACKET_PAIRS = {"{": "}", "[": "]"}
+_JSON_DECODER = json.JSONDecoder()
+
+# Lifestyle noise that slips into keyword news searches; dropped before the
+# LLM filter. Deliberately narrow: words that are also company or people
+# names ("Cook", "Campbell's Soup", "Pie Insurance") are left to Gemini
+_OFFTOPIC_RE = re.compile(r"\b(?:recipes?|vegan|thanksgiving|cooking)\b", re.IGNORECASE)
+# Legal suffixes stripped so "Apple Inc." still protects "Apple ..." headlines
+_COMPANY_SUFFIX_RE = re.compile(
+    r"[,.]?\s+(?:inc|corp|corporation|co|company|ltd|plc|llc|holdings?)\.?$", re.IGNORECASE
+)
+
+def utc_today(now: Optional[datetime] = None) -> date:
+    """Return today's date in UTC timezone (of `now` if given, e.g. a pipeline-wide timestamp)."""
+    return (now or datetime.now(timezone.utc)).date()
 
 def ymd(d: Union[datetime, date]) -> str:
     """Convert datetime or date object to YYYY-MM-DD string."""
     return d.strftime("%Y-%m-%d")
 
 def norm_title(t: str) -> str:
-    """Normalize title for deduplication: lowercase and collapse whitespace."""
-    t = (t or "").strip().lower()
-    t = re.sub(r"\s+", " ", t)
-    return t
+    """Normalize title for deduplication: casefold and collapse whitespace."""
+    # split()/join strips and collapses all Unicode whitespace in one C-level pass
+    return " ".join((t or "").casefold().split())
+
+def norm_title_series(titles: pd.Series) -> pd.Series:
+    """Vectorized norm_title() for a whole column (pandas str ops, no per-row Python)."""
+    return (
+        titles.fillna("")
+        .str.strip()
+        .str.casefold()
+        .str.replace(_WS_RE, " ", regex=True)
+    )
+
+def drop_offtopic_headlines(df: pd.DataFrame, company: str = "", ticker: str = "") -> pd.DataFrame:
+    """
+    Drop headlines whose title matches an obvious off-topic keyword.
+
+    A single vectorized regex pass, so clearly irrelevant rows never cost an
+    LLM relevance call. Titles that name the company or ticker are always
+    kept, whatever else they contain.
+    """
+    if df.empty or "title" not in df.columns:
+        return df
+    titles = df["title"]
+    mask = ~titles.str.contains(_OFFTOPIC_RE, na=False)
+    for term in (_COMPANY_SUFFIX_RE.sub("", (company or "").strip()), ticker):
+        term = (term or "").strip()
+        if term:
+            mask |= titles.str.contains(rf"\b{re.escape(term)}\b", case=False, regex=True, na=False)
+    return df[mask.to_numpy()].reset_index(drop=True)
+
+def to_arrow_strings(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """
+    Cast text columns to Arrow-backed strings when pyarrow is installed.
+
+    Arrow strings are stored in contiguous buffers, so .str ops and
+    duplicated() run in Arrow's C++ kernels instead of over Python objects.
+    No-op without pyarrow.
+    """
+    if _ARROW_STRING is None or df.empty:
+        return df
+    return df.astype({c: _ARROW_STRING for c in columns if c in df.columns})
+
+def to_object_strings(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """
+    Undo to_arrow_strings(): plain object columns with None for missing values.
+
+    Downstream code does `row.get("description") or ""`, which fails on pd.NA.
+    """
+    if _ARROW_STRING is None or df.empty:
+        return df
+    df = df.copy()
+    for c in columns:
+        if c in df.columns:
+            col = df[c].astype(object)
+            col[col.isna()] = None
+            df[c] = col
+    return df
+
+def extract_json_block(text: str, open_char: str = "{") -> Optional[str]:
+    """
+    Return the first balanced JSON object/array in an LLM response.
+
+    Single linear scan that tracks bracket depth and skips brackets inside
+    string literals, so it handles nested objects and trailing prose without
+    regex backtracking. Markdown code fences are ignored.
 
-def drop_older_than(df: pd.DataFrame, days: int) -> pd.DataFrame:
+    Args:
+        text: Raw LLM response text
+        open_char: "{" for an object, "[" for an array
+
+    Returns:
+        The JSON substring, or None if no complete block is found
+    """
+    if not text:
+        return None
+
+    close_char = _BRACKET_PAIRS[open_char]
+    start = text.find(open_char)
+    if start < 0:
+        return None
+
+    depth = 0
+    in_str = False
+    escaped = False
+
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_str:
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_str = False
+        elif c == '"':
+            in_str = True
+        elif c == open_char:
+            depth += 1
+        elif c == close_char:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return None
+
+def load_json_block(text: str, open_char: str = "{") -> Optional[Any]:
+    """
+    Parse the first JSON object/array in an LLM response.
+
+    Decodes in place from the first opening bracket with raw_decode (one
+    linear pass, no substring copy, trailing prose ignored). Falls back to
+    extract_json_block() when something before the real JSON starts with the
+    same bracket.
+
+    Args:
+        text: Raw LLM response text
+        open_char: "{" for an object, "[" for an array
+
+    Returns:
+        The decoded value, or None if no valid JSON block is found
+    """
+    if not text:
+        return None
+
+    start = text.find(open_char)
+    if start < 0:
+        return None
+
+    try:
+        return _JSON_DECODER.raw_decode(text, start)[0]
+    except json.JSONDecodeError:
+        pass
+
+    block = extract_json_block(text[start + 1:], open_char)
+    if not block:
+        return None
+    try:
+        return json.loads(block)
+    except json.JSONDecodeError:
+        return None
+
+def drop_older_than(df: pd.DataFrame, days: int, now: Optional[datetime] = None) -> pd.DataFrame:
     """
     Filter DataFrame to keep only rows with dates within the last N days.
 
     Args:
         df: DataFrame with a 'date' column (timezone-aware datetime)
         days: Number of days to look back from now
+        now: Reference time (UTC-aware); defaults to the current time
 
     Returns:
         Filtered DataFrame with only recent rows
@@ -31,10 +190,17 @@ def drop_older_than(df: pd.DataFrame, days: int) -> pd.DataFrame:
     if df.empty or "date" not in df.columns:
         return df
 
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=days)
+    dates = df["date"]
 
-    # Filter rows where date is after cutoff
-    mask = df["date"] >= cutoff
-    filtered = df[mask].reset_index(drop=True)
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        # .values is datetime64 in UTC (tz-aware columns are converted, naive
+        # ones are taken as UTC), so compare raw numpy arrays; NaT -> False
+        cutoff64 = np.datetime64(cutoff.replace(tzinfo=None), "ns")
+        mask = dates.values >= cutoff64
+    else:
+        # object column (e.g. mixed/unparsed dates): let pandas compare
+        mask = (dates >= cutoff).to_numpy(dtype=bool)
 
-    return filtered
\ No newline at end of file
+    # Filter rows where date is after cutoff
+    return df.iloc[np.flatnonzero(mask)].reset_index(drop=True)
\ No newline at end of file